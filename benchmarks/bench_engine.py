@@ -0,0 +1,319 @@
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import platform
+import tempfile
+import threading
+import subprocess
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(REPO_ROOT, "tubetube"))
+
+import yt_dlp
+from yt_dlp.extractor.common import InfoExtractor
+
+RESULTS_DIR = os.path.join(REPO_ROOT, "benchmarks", "results")
+CHUNK_SIZE = 64 * 1024
+
+
+class SyntheticMediaHandler(BaseHTTPRequestHandler):
+    media_size = 1024 * 1024
+    rate_limit = 0
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path.startswith("/playlist/"):
+            self._send_playlist(path.rsplit("/", 1)[-1])
+        elif path.startswith("/video/"):
+            self._send_media()
+        else:
+            self.send_error(404)
+
+    def _send_playlist(self, playlist_id):
+        name, _, count = playlist_id.rpartition("-")
+        host = f"http://127.0.0.1:{self.server.server_port}"
+        entries = [{"id": f"{name}-{i}", "title": f"{name} {i}", "url": f"{host}/video/{name}-{i}.mp4"} for i in range(int(count))]
+        body = json.dumps({"id": playlist_id, "title": name, "entries": entries}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_media(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "video/mp4")
+        self.send_header("Content-Length", str(self.media_size))
+        self.end_headers()
+        chunk = b"\0" * CHUNK_SIZE
+        remaining = self.media_size
+        started = time.monotonic()
+        sent = 0
+        while remaining > 0:
+            block = chunk[: min(CHUNK_SIZE, remaining)]
+            self.wfile.write(block)
+            remaining -= len(block)
+            sent += len(block)
+            if self.rate_limit:
+                ahead = sent / self.rate_limit - (time.monotonic() - started)
+                if ahead > 0:
+                    time.sleep(ahead)
+
+
+class BenchPlaylistIE(InfoExtractor):
+    IE_NAME = "benchplaylist"
+    _VALID_URL = r"https?://127\.0\.0\.1:\d+/playlist/(?P<id>[^/?#]+)"
+
+    def _real_extract(self, url):
+        playlist_id = self._match_id(url)
+        data = self._download_json(url, playlist_id)
+        entries = [self.url_result(entry["url"], video_id=entry["id"], video_title=entry["title"]) for entry in data["entries"]]
+        return self.playlist_result(entries, playlist_id, data["title"])
+
+
+class FakeSocketIO:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.events = {}
+        self.bytes = {}
+
+    def emit(self, event, data=None, to=None, **kwargs):
+        size = len(json.dumps(data, separators=(",", ":"), default=str)) if data is not None else 0
+        with self.lock:
+            self.events[event] = self.events.get(event, 0) + 1
+            self.bytes[event] = self.bytes.get(event, 0) + size
+
+    def totals(self):
+        with self.lock:
+            return {"events": dict(self.events), "bytes": dict(self.bytes)}
+
+
+def create_manager(work_dir, thread_count):
+    from yt_downloader import DownloadManager
+
+    class BenchmarkManager(DownloadManager):
+        def __init__(self):
+            self.socketio = FakeSocketIO()
+            self.data_folder = os.path.join(work_dir, "data")
+            self.config_folder = os.path.join(work_dir, "config")
+            self.folder_locations = {"Bench": {}}
+            self.cookies_file = None
+            DownloadManager.__init__(self)
+
+        def _create_parsing_ydl(self):
+            ydl = yt_dlp.YoutubeDL(dict(self.parsing_opts), auto_init=False)
+            ydl.add_info_extractor(BenchPlaylistIE())
+            ydl.add_default_info_extractors()
+            return ydl
+
+        def _build_ydl_opts(self, item, options=None):
+            ydl_opts = super()._build_ydl_opts(item, options)
+            ydl_opts["postprocessors"] = []
+            ydl_opts["writethumbnail"] = False
+            ydl_opts["writesubtitles"] = False
+            ydl_opts["writeautomaticsub"] = False
+            return ydl_opts
+
+    os.makedirs(work_dir, exist_ok=True)
+    os.environ["TUBETUBE_TEMP_DIR"] = os.path.join(work_dir, "temp")
+    os.environ["TUBETUBE_APP_CONFIG"] = os.path.join(work_dir, "config", "app_config.yaml")
+    os.environ["TUBETUBE_JOB_STORE"] = os.path.join(work_dir, "config", "jobs.db")
+    os.environ["THREAD_COUNT"] = str(thread_count)
+    os.environ.setdefault("METADATA_CACHE", "false")
+    os.environ.setdefault("CONFIG_WATCH_INTERVAL", "0")
+    os.environ.setdefault("SEARCH_INDEX", "false")
+    os.environ.setdefault("DOWNLOAD_ARCHIVE", "false")
+    return BenchmarkManager()
+
+
+def wait_for(condition, timeout):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def enqueue_playlist(manager, base_url, name, count, timeout):
+    started = time.monotonic()
+    manager.add_to_queue({"url": f"{base_url}/playlist/{name}-{count}", "folder_name": "Bench", "download_settings": {"audio_format_id": "best"}, "audio_only": True})
+    completed = wait_for(lambda: len(manager.all_items) >= count, timeout)
+    return time.monotonic() - started, completed
+
+
+def bench_enqueue(base_url, work_root, sizes, timeout):
+    results = []
+    for size in sizes:
+        manager = create_manager(os.path.join(work_root, f"enqueue-{size}"), 0)
+        elapsed, completed = enqueue_playlist(manager, base_url, f"enqueue{size}", size, timeout)
+        time.sleep(manager.broadcaster.interval * 4)
+        emitted = manager.socketio.totals()
+        total_events = sum(emitted["events"].values())
+        total_bytes = sum(emitted["bytes"].values())
+        results.append({
+            "items": size,
+            "completed": completed,
+            "seconds": round(elapsed, 4),
+            "items_per_second": round(len(manager.all_items) / elapsed, 1) if elapsed else None,
+            "emit_events": emitted["events"],
+            "emit_bytes": emitted["bytes"],
+            "emit_events_per_item": round(total_events / size, 4),
+            "emit_bytes_per_item": round(total_bytes / size, 1),
+        })
+        results[-1]["duplicate_check"] = bench_duplicate_check(manager, base_url, f"enqueue{size}", size)
+        manager.shutdown()
+        print(f"Enqueued {size} items in {elapsed:.2f}s", file=sys.stderr)
+    return results
+
+
+def bench_duplicate_check(manager, base_url, name, count, lookups=10000):
+    hit_urls = [f"{base_url}/video/{name}-{i % count}.mp4" for i in range(lookups)]
+    miss_urls = [f"{base_url}/video/missing-{i}.mp4" for i in range(lookups)]
+    timings = {}
+    for label, urls in (("hit", hit_urls), ("miss", miss_urls)):
+        started = time.perf_counter()
+        for url in urls:
+            with manager.lock:
+                manager._find_duplicate(url)
+        timings[f"{label}_microseconds"] = round((time.perf_counter() - started) / lookups * 1e6, 3)
+    return timings
+
+
+def bench_downloads(base_url, work_root, worker_counts, download_count, timeout):
+    results = []
+    for worker_count in worker_counts:
+        manager = create_manager(os.path.join(work_root, f"downloads-{worker_count}"), worker_count)
+        started = time.monotonic()
+        enqueue_playlist(manager, base_url, f"downloads{worker_count}", download_count, timeout)
+        finished = wait_for(lambda: all(item["status"] == "Complete" or item["status"].startswith("Failed") for item in list(manager.all_items.values())), timeout)
+        elapsed = time.monotonic() - started
+        completed = sum(1 for item in manager.all_items.values() if item["status"] == "Complete")
+        results.append({
+            "workers": worker_count,
+            "downloads": download_count,
+            "completed": completed,
+            "finished": finished,
+            "seconds": round(elapsed, 3),
+            "downloads_per_minute": round(completed / elapsed * 60, 1) if elapsed else None,
+        })
+        manager.shutdown()
+        print(f"{worker_count} workers: {completed} downloads in {elapsed:.2f}s", file=sys.stderr)
+    return results
+
+
+def bench_progress_hook(work_root, calls):
+    manager = create_manager(os.path.join(work_root, "progress-hook"), 0)
+    download_id = 0
+    item = {"id": download_id, "title": "hook", "url": "http://127.0.0.1/hook", "status": "Downloading", "progress": "0%"}
+    with manager.lock:
+        manager._register_item(item)
+    manager.progress_ticker.track(download_id, item)
+    d = {"status": "downloading", "downloaded_bytes": 0, "total_bytes": calls * CHUNK_SIZE, "speed": 1024 * 1024, "eta": 10, "elapsed": 1, "tmpfilename": "hook.part", "info_dict": {}}
+
+    noop_hook = lambda d: None
+    started = time.perf_counter()
+    for i in range(calls):
+        d["downloaded_bytes"] = i * CHUNK_SIZE
+        noop_hook(d)
+    baseline = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for i in range(calls):
+        d["downloaded_bytes"] = i * CHUNK_SIZE
+        manager._progress_hook(d, download_id)
+    elapsed = time.perf_counter() - started
+    manager.shutdown()
+    return {
+        "calls": calls,
+        "microseconds_per_call": round(elapsed / calls * 1e6, 3),
+        "baseline_microseconds_per_call": round(baseline / calls * 1e6, 3),
+    }
+
+
+def _time_cold_import(statement):
+    code = f"import time; started = time.perf_counter(); {statement}; print(time.perf_counter() - started)"
+    env = dict(os.environ, PYTHONPATH=os.path.join(REPO_ROOT, "tubetube"))
+    output = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True).stdout
+    return round(float(output.strip().splitlines()[-1]), 4)
+
+
+def bench_startup(work_root):
+    results = {
+        "import_seconds": _time_cold_import("import yt_downloader"),
+        "extractor_load_seconds": _time_cold_import("import helpers; helpers.load_extractors()"),
+    }
+    started = time.perf_counter()
+    manager = create_manager(os.path.join(work_root, "startup"), 1)
+    results["manager_init_seconds"] = round(time.perf_counter() - started, 4)
+    started = time.perf_counter()
+    manager.extraction_pool.ready.wait(60)
+    results["extractor_ready_seconds"] = round(time.perf_counter() - started, 4)
+    manager.shutdown()
+    print(f"startup: imports {results['import_seconds']}s, manager {results['manager_init_seconds']}s", file=sys.stderr)
+    return results
+
+
+def parse_int_list(value):
+    return [int(part) for part in value.split(",") if part.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the TubeTube download engine.")
+    parser.add_argument("--output", default=os.path.join(RESULTS_DIR, f"bench_engine-{time.strftime('%Y%m%d-%H%M%S')}.json"), help="JSON file to write the results to")
+    parser.add_argument("--sizes", type=parse_int_list, default=[1000, 10000, 50000], help="playlist sizes for the enqueue benchmark")
+    parser.add_argument("--workers", type=parse_int_list, default=[1, 2, 4, 8], help="worker counts for the download benchmark")
+    parser.add_argument("--downloads", type=int, default=40, help="downloads per worker count")
+    parser.add_argument("--media-size", type=int, default=1024 * 1024, help="bytes served per synthetic video")
+    parser.add_argument("--media-rate", type=int, default=2 * 1024 * 1024, help="bytes/s per connection, 0 for unlimited")
+    parser.add_argument("--hook-calls", type=int, default=100000, help="progress hook calls to time")
+    parser.add_argument("--timeout", type=float, default=600, help="seconds to wait for each scenario")
+    parser.add_argument("--keep", action="store_true", help="keep the temporary working directory")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s - %(levelname)s - %(message)s")
+    SyntheticMediaHandler.media_size = args.media_size
+    SyntheticMediaHandler.rate_limit = args.media_rate
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SyntheticMediaHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True, name="MediaServer").start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    work_root = tempfile.mkdtemp(prefix="tubetube-bench-")
+    try:
+        results = {
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "yt_dlp": yt_dlp.version.__version__,
+            "parameters": {key: value for key, value in vars(args).items() if key not in {"output", "keep"}},
+            "startup": bench_startup(work_root),
+            "progress_hook": bench_progress_hook(work_root, args.hook_calls),
+            "enqueue": bench_enqueue(base_url, work_root, args.sizes, args.timeout),
+            "downloads": bench_downloads(base_url, work_root, args.workers, args.downloads, args.timeout),
+        }
+    finally:
+        server.shutdown()
+        if not args.keep:
+            shutil.rmtree(work_root, ignore_errors=True)
+
+    output_dir = os.path.dirname(os.path.abspath(args.output))
+    os.makedirs(output_dir, exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+    print(json.dumps(results, indent=2))
+    print(f"Results written to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
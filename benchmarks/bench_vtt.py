@@ -0,0 +1,110 @@
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import tracemalloc
+
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, REPO_ROOT)
+
+from tubetube.vtt_tool import VttSubtitleTool
+
+RESULTS_DIR = os.path.join(REPO_ROOT, "benchmarks", "results")
+WORDS = "so today we are going to look at how the download queue works and why it matters for large playlists".split()
+# Chinese auto-subs have no spaces between words, so each caption line is a single token.
+CJK_WORDS = list("大家好歡迎收看今天我們來聊聊下載佇列如何運作以及它為什麼對大型播放清單很重要")
+LANGUAGES = {"en": (WORDS, " "), "zh-Hant": (CJK_WORDS, "")}
+
+
+def _timestamp(ms):
+    hours, ms = divmod(ms, 3600000)
+    minutes, ms = divmod(ms, 60000)
+    seconds, ms = divmod(ms, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}.{ms:03d}"
+
+
+def write_rolling_captions(path, lines, language="en"):
+    # Mimics YouTube auto-subs: a two-line cue with inline word timings, then a 10ms cue repeating the new line.
+    # Returns the caption lines so the merged output can be checked against them.
+    vocabulary, separator = LANGUAGES[language]
+    spoken = []
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(f"WEBVTT\nKind: captions\nLanguage: {language}\n\n")
+        previous = ""
+        start = 0
+        for index in range(lines):
+            words = [vocabulary[(index * 8 + offset) % len(vocabulary)] for offset in range(8)]
+            timed = "".join(f"<{_timestamp(start + offset * 200)}><c>{separator}{word}</c>" for offset, word in enumerate(words[1:], 1))
+            file.write(f"{_timestamp(start)} --> {_timestamp(start + 2000)} align:start position:0%\n{previous or ' '}\n{words[0]}{timed}\n\n")
+            previous = separator.join(words)
+            spoken.append(previous)
+            file.write(f"{_timestamp(start + 2000)} --> {_timestamp(start + 2010)} align:start position:0%\n{previous}\n \n\n")
+            start += 2010
+    return spoken
+
+
+def bench_file(tool, path, repeat, expected=None):
+    result = {"file": os.path.basename(path), "bytes": os.path.getsize(path)}
+    for label, merge_rolling in (("raw", False), ("merged", True)):
+        text = ""
+        started = time.perf_counter()
+        for _ in range(repeat):
+            text = tool.extract_text_from_file(path, merge_rolling=merge_rolling)
+        elapsed = (time.perf_counter() - started) / repeat
+        result[label] = {"chars": len(text), "words": len(text.split()), "seconds": round(elapsed, 4)}
+
+    tracemalloc.start()
+    tool.extract_text_from_file(path)
+    result["merged"]["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    if expected is not None:
+        # Every caption line should appear exactly once after merging, whatever the script.
+        merged = tool.extract_text_from_file(path)
+        result["matches_source"] = merged.split() == " ".join(expected).split()
+
+    raw_chars = result["raw"]["chars"]
+    result["reduction"] = round(1 - result["merged"]["chars"] / raw_chars, 3) if raw_chars else None
+    print(f"{result['file']}: {raw_chars} -> {result['merged']['chars']} chars in {result['merged']['seconds']}s", file=sys.stderr)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark rolling caption merging in VttSubtitleTool.")
+    parser.add_argument("files", nargs="*", help="VTT files to measure, e.g. auto-subs downloaded with ALLOW_AUTO_SUBS")
+    parser.add_argument("--output", default=os.path.join(RESULTS_DIR, f"bench_vtt-{time.strftime('%Y%m%d-%H%M%S')}.json"), help="JSON file to write the results to")
+    parser.add_argument("--synthetic-lines", type=int, default=20000, help="caption lines in the generated file when no files are given")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per file and mode")
+    args = parser.parse_args()
+
+    tool = VttSubtitleTool()
+    results = {
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {key: value for key, value in vars(args).items() if key != "output"},
+        "files": [],
+    }
+    if args.files:
+        results["files"] = [bench_file(tool, path, args.repeat) for path in args.files]
+    else:
+        with tempfile.TemporaryDirectory(prefix="tubetube-bench-vtt-") as work_root:
+            for language in LANGUAGES:
+                path = os.path.join(work_root, f"rolling-{args.synthetic_lines}.{language}.vtt")
+                expected = write_rolling_captions(path, args.synthetic_lines, language)
+                results["files"].append(bench_file(tool, path, args.repeat, expected))
+
+    output_dir = os.path.dirname(os.path.abspath(args.output))
+    os.makedirs(output_dir, exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+    print(json.dumps(results, indent=2))
+    print(f"Results written to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import os
+import re
+import json
+import time
+import logging
+import threading
+import helpers
+
+
+AUDIO_EXTENSIONS = (".m4a", ".mp3", ".opus", ".ogg", ".flac", ".wav", ".aac")
+MEDIA_EXTENSIONS = (".mp4", ".mkv", ".webm", ".mov") + AUDIO_EXTENSIONS
+KINDS = ("video", "audio")
+BRACKETED_ID_RE = re.compile(r"\[([A-Za-z0-9_-]{11})\]")
+
+
+class DownloadArchive:
+    def __init__(self, path, audio_path=None):
+        # Audio-only and video downloads are archived in separate files, so one doesn't block the other.
+        self.path = path
+        self.paths = {"video": path, "audio": audio_path or f"{os.path.splitext(path)[0]}_audio.txt"}
+        self.lock = threading.Lock()
+        self.ids = {kind: set() for kind in KINDS}
+
+        archive_dir = os.path.dirname(path)
+        if archive_dir:
+            os.makedirs(archive_dir, exist_ok=True)
+        for kind, kind_path in self.paths.items():
+            try:
+                with open(kind_path, "r", encoding="utf-8") as file:
+                    self.ids[kind] = {line.strip() for line in file if line.strip()}
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logging.error(f"Unable to read download archive {kind_path}: {e}")
+        logging.info(f"Download archive: {len(self.ids['video'])} video and {len(self.ids['audio'])} audio entries in {archive_dir or '.'}")
+
+    def contains(self, archive_id, kind="video"):
+        return archive_id in self.ids[kind]
+
+    def add(self, archive_id, kind="video"):
+        return self.add_many([archive_id], kind)
+
+    def add_many(self, archive_ids, kind="video"):
+        with self.lock:
+            ids = self.ids[kind]
+            new_ids = [archive_id for archive_id in dict.fromkeys(archive_ids) if archive_id and archive_id not in ids]
+            if not new_ids:
+                return 0
+            try:
+                with open(self.paths[kind], "a", encoding="utf-8") as file:
+                    file.write("".join(f"{archive_id}\n" for archive_id in new_ids))
+            except OSError as e:
+                logging.error(f"Unable to write download archive: {e}")
+            ids.update(new_ids)
+        return len(new_ids)
+
+    def needs_seed(self):
+        return not os.path.exists(f"{self.path}.seeded")
+
+    def start_seed(self, data_folder):
+        threading.Thread(target=self.seed, args=(data_folder,), daemon=True, name="ArchiveSeed").start()
+
+    def seed(self, data_folder):
+        # Only names and .info.json files are read, probing every media file for its source URL is too slow for large libraries.
+        started = time.monotonic()
+        scanned = added = 0
+        try:
+            for root, dirs, files in os.walk(data_folder):
+                dirs[:] = [name for name in dirs if not name.startswith(".")]
+                batches = {kind: [] for kind in KINDS}
+                for name in files:
+                    file_path = os.path.join(root, name)
+                    if name.endswith(".info.json"):
+                        archive_id, kind = self._id_from_info_json(file_path)
+                        batches[kind].append(archive_id)
+                    elif name.lower().endswith(MEDIA_EXTENSIONS):
+                        scanned += 1
+                        match = BRACKETED_ID_RE.search(name)
+                        if match:
+                            kind = "audio" if name.lower().endswith(AUDIO_EXTENSIONS) else "video"
+                            batches[kind].append(f"youtube {match.group(1)}")
+                added += sum(self.add_many(batch, kind) for kind, batch in batches.items())
+            with open(f"{self.path}.seeded", "w", encoding="utf-8") as file:
+                file.write(f"{time.time()}\n")
+        except OSError as e:
+            logging.error(f"Download archive seeding stopped: {e}")
+        logging.info(f"Download archive seeded from {data_folder}: {scanned} media files, {added} new entries in {time.monotonic() - started:.1f}s.")
+
+    def _id_from_info_json(self, file_path):
+        try:
+            with open(file_path, "r", encoding="utf-8") as file:
+                info = json.load(file)
+            return helpers.archive_id(info), "audio" if info.get("vcodec") == "none" else "video"
+        except (OSError, ValueError, AttributeError):
+            return None, "video"
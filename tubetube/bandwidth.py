@@ -0,0 +1,151 @@
+import time
+import logging
+import datetime
+import threading
+from yt_dlp.utils import parse_bytes, format_bytes
+
+
+def parse_rate(value):
+    if value is None or value == "":
+        return 0
+    if isinstance(value, (int, float)):
+        return max(int(value), 0)
+    value_str = str(value).strip()
+    if value_str.lower().endswith("/s"):
+        value_str = value_str[:-2]
+    if value_str.lower() in {"", "0", "none", "off", "unlimited"}:
+        return 0
+    rate = parse_bytes(value_str)
+    if rate is None:
+        raise ValueError(f"Invalid bandwidth limit: {value}")
+    return rate
+
+
+def parse_schedule(raw_schedule):
+    if not raw_schedule:
+        return []
+    if isinstance(raw_schedule, str):
+        entries = []
+        for part in raw_schedule.split(","):
+            if not part.strip():
+                continue
+            window, _, limit = part.partition("=")
+            start, _, end = window.partition("-")
+            entries.append({"start": start, "end": end, "limit": limit})
+        raw_schedule = entries
+
+    schedule = []
+    for entry in raw_schedule:
+        try:
+            start = datetime.datetime.strptime(str(entry["start"]).strip(), "%H:%M").time()
+            end = datetime.datetime.strptime(str(entry["end"]).strip(), "%H:%M").time()
+            schedule.append((start, end, parse_rate(entry.get("limit"))))
+        except (KeyError, TypeError, ValueError) as e:
+            logging.warning(f"Ignoring invalid bandwidth schedule entry {entry}: {e}")
+    return schedule
+
+
+class BandwidthGovernor:
+    def __init__(self, default_limit=0, schedule=None, check_interval=30):
+        self.default_limit = default_limit
+        self.schedule = schedule or []
+        self.check_interval = check_interval
+        self.lock = threading.Lock()
+        self.override = None
+        self.limit = 0
+        self.allocation = 0
+        self.buckets = {}
+        self.next_check = 0.0
+
+        with self.lock:
+            self._refresh_locked(time.monotonic())
+        logging.info(f"Bandwidth limit: {self._describe(self.limit)}, {len(self.schedule)} scheduled windows.")
+
+    def _describe(self, limit):
+        return f"{format_bytes(limit)}/s" if limit else "unlimited"
+
+    def _scheduled_limit(self):
+        now = datetime.datetime.now().time()
+        for start, end, limit in self.schedule:
+            if start <= end:
+                if start <= now < end:
+                    return limit
+            elif now >= start or now < end:
+                return limit
+        return self.default_limit
+
+    def _refresh_locked(self, now):
+        self.next_check = now + self.check_interval
+        limit = self.override if self.override is not None else self._scheduled_limit()
+        if limit != self.limit:
+            logging.info(f"Bandwidth limit changed from {self._describe(self.limit)} to {self._describe(limit)}.")
+            self.limit = limit
+            self._rebalance_locked(now)
+
+    def _rebalance_locked(self, now):
+        self.allocation = self.limit / len(self.buckets) if self.limit and self.buckets else 0
+        for bucket in self.buckets.values():
+            bucket["tokens"] = min(bucket["tokens"], self.allocation)
+            bucket["refilled_at"] = now
+
+    def set_defaults(self, default_limit, schedule=None):
+        with self.lock:
+            self.default_limit = default_limit
+            self.schedule = schedule or []
+            self._refresh_locked(time.monotonic())
+        return self.status()
+
+    def set_limit(self, limit):
+        with self.lock:
+            self.override = limit
+            self._refresh_locked(time.monotonic())
+        return self.status()
+
+    def release(self, download_id):
+        with self.lock:
+            if self.buckets.pop(download_id, None) is not None:
+                self._rebalance_locked(time.monotonic())
+
+    def allocation_for(self, download_id):
+        return self.allocation if download_id in self.buckets else 0
+
+    def throttle(self, download_id, file_key, downloaded_bytes):
+        now = time.monotonic()
+        with self.lock:
+            if now >= self.next_check:
+                self._refresh_locked(now)
+
+            bucket = self.buckets.get(download_id)
+            if bucket is None:
+                bucket = {"file": file_key, "seen_bytes": downloaded_bytes, "tokens": 0.0, "refilled_at": now}
+                self.buckets[download_id] = bucket
+                self._rebalance_locked(now)
+                return 0.0
+
+            if bucket["file"] != file_key or downloaded_bytes < bucket["seen_bytes"]:
+                bucket["file"] = file_key
+                bucket["seen_bytes"] = downloaded_bytes
+                return 0.0
+
+            consumed = downloaded_bytes - bucket["seen_bytes"]
+            bucket["seen_bytes"] = downloaded_bytes
+            if not self.allocation:
+                return 0.0
+
+            bucket["tokens"] = min(self.allocation, bucket["tokens"] + (now - bucket["refilled_at"]) * self.allocation)
+            bucket["refilled_at"] = now
+            bucket["tokens"] -= consumed
+            if bucket["tokens"] >= 0:
+                return 0.0
+            return -bucket["tokens"] / self.allocation
+
+    def status(self):
+        with self.lock:
+            return {
+                "limit": self.limit,
+                "override": self.override,
+                "default_limit": self.default_limit,
+                "scheduled_limit": self._scheduled_limit(),
+                "allocation": self.allocation,
+                "active": sorted(self.buckets),
+            }
@@ -0,0 +1,82 @@
+import logging
+import threading
+
+
+class Broadcaster:
+    def __init__(self, socketio, interval=0.25, batch_size=500):
+        self.socketio = socketio
+        self.interval = interval
+        self.batch_size = batch_size
+        self.version = 0
+        self.lock = threading.Lock()
+        self.pending_changes = {}
+        self.pending_items = {}
+        self.flush_event = threading.Event()
+
+        flusher = threading.Thread(target=self._run, daemon=True, name="Broadcaster")
+        flusher.start()
+        logging.info(f"Broadcasting list changes every {interval}s or {batch_size} changes.")
+
+    def item_added(self, item):
+        self._record(item["id"], "added", item)
+
+    def item_updated(self, item):
+        self._record(item["id"], "updated", item)
+
+    def item_removed(self, item_id):
+        self._record(item_id, "removed", None)
+
+    def _record(self, item_id, change, item):
+        with self.lock:
+            previous_change = self.pending_changes.get(item_id)
+            if previous_change == "removed":
+                return
+            if previous_change == "added":
+                if change == "removed":
+                    del self.pending_changes[item_id]
+                    del self.pending_items[item_id]
+                    return
+                change = "added"
+            self.pending_changes[item_id] = change
+            self.pending_items[item_id] = item
+            batch_full = len(self.pending_changes) >= self.batch_size
+
+        if batch_full:
+            self.flush_event.set()
+
+    def _run(self):
+        while True:
+            self.flush_event.wait(self.interval)
+            self.flush_event.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logging.error(f"Error broadcasting list changes: {e}")
+
+    def flush(self):
+        with self.lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self.pending_changes:
+            return
+
+        delta = {"added": [], "updated": [], "removed": []}
+        for item_id, change in self.pending_changes.items():
+            if change == "removed":
+                delta["removed"].append(item_id)
+            else:
+                delta[change].append(dict(self.pending_items[item_id]))
+        self.pending_changes = {}
+        self.pending_items = {}
+
+        self.version += 1
+        delta["version"] = self.version
+        delta["base_version"] = self.version - 1
+        self.socketio.emit("download_list_delta", delta)
+
+    def snapshot(self, items):
+        # Callers hold the lock guarding items, so the copy matches the version once pending changes are flushed.
+        with self.lock:
+            self._flush_locked()
+            return {"version": self.version, "items": [dict(item) for item in items]}
@@ -0,0 +1,43 @@
+import os
+import time
+import logging
+import threading
+
+
+class ConfigWatcher:
+    def __init__(self, paths, on_change, interval=2.0):
+        self.on_change = on_change
+        self.interval = interval
+        self.signatures = {path: self._signature(path) for path in paths if path}
+        self.stop_event = threading.Event()
+        threading.Thread(target=self._run, daemon=True, name="ConfigWatcher").start()
+        logging.info(f"Watching {len(self.signatures)} config files for changes every {interval}s.")
+
+    def _signature(self, path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _run(self):
+        while not self.stop_event.wait(self.interval):
+            for path, signature in list(self.signatures.items()):
+                current = self._signature(path)
+                if current == signature:
+                    continue
+                # Editors often truncate then write, wait for the file to settle before reading it.
+                time.sleep(min(self.interval, 0.5))
+                if self._signature(path) != current:
+                    continue
+                self.signatures[path] = current
+                if current is None:
+                    logging.warning(f"Config file {path} was removed, keeping the current settings.")
+                    continue
+                try:
+                    self.on_change(path)
+                except Exception as e:
+                    logging.error(f"Config reload failed for {path}: {e}")
+
+    def stop(self):
+        self.stop_event.set()
@@ -0,0 +1,90 @@
+import time
+import queue
+import logging
+import threading
+
+
+class ExtractionPool:
+    def __init__(self, ydl_factory, worker_count=4, queue_size=64, submit_timeout=30):
+        self.ydl_factory = ydl_factory
+        self.submit_timeout = submit_timeout
+        self.jobs = queue.Queue(maxsize=max(queue_size, 1))
+        self.stats_lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.last_seconds = 0.0
+        self.total_wait_seconds = 0.0
+        self.ready = threading.Event()
+        self.generation = 0
+
+        for i in range(max(worker_count, 1)):
+            worker = threading.Thread(target=self._run, daemon=True, name=f"Extractor-{i}")
+            worker.start()
+        logging.info(f"Started {max(worker_count, 1)} extraction workers with a queue of {self.jobs.maxsize}.")
+
+    def submit(self, func, *args):
+        self.jobs.put((func, args, time.monotonic()), timeout=self.submit_timeout)
+
+    def refresh(self):
+        self.generation += 1
+
+    def _create_ydl(self, previous=None):
+        try:
+            if previous is not None:
+                previous.close()
+            return self.ydl_factory()
+        except Exception as e:
+            logging.error(f"Unable to create a YoutubeDL for extraction, retrying with the next job: {e}")
+            return None
+
+    def _run(self):
+        generation = self.generation
+        ydl = self._create_ydl()
+        self.ready.set()
+        while True:
+            func, args, submitted_at = self.jobs.get()
+            if ydl is None or generation != self.generation:
+                generation = self.generation
+                ydl = self._create_ydl(ydl)
+            started_at = time.monotonic()
+            with self.stats_lock:
+                self.in_flight += 1
+            succeeded = False
+            try:
+                if ydl is None:
+                    raise RuntimeError("no YoutubeDL instance available")
+                succeeded = func(ydl, *args) is not False
+            except Exception as e:
+                logging.error(f"Extraction job failed: {e}")
+            finally:
+                elapsed = time.monotonic() - started_at
+                waited = started_at - submitted_at
+                with self.stats_lock:
+                    self.in_flight -= 1
+                    if succeeded:
+                        self.completed += 1
+                    else:
+                        self.failed += 1
+                    self.total_seconds += elapsed
+                    self.total_wait_seconds += waited
+                    self.last_seconds = elapsed
+                    self.max_seconds = max(self.max_seconds, elapsed)
+                self.jobs.task_done()
+                logging.info(f"Extraction took {elapsed:.2f}s after waiting {waited:.2f}s, {self.jobs.qsize()} extractions queued.")
+
+    def stats(self):
+        with self.stats_lock:
+            finished = self.completed + self.failed
+            return {
+                "queue_depth": self.jobs.qsize(),
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+                "failed": self.failed,
+                "average_seconds": self.total_seconds / finished if finished else 0.0,
+                "average_wait_seconds": self.total_wait_seconds / finished if finished else 0.0,
+                "max_seconds": self.max_seconds,
+                "last_seconds": self.last_seconds,
+            }
@@ -1,21 +1,115 @@
 import re
 import yt_dlp
+from yt_dlp.extractor import gen_extractor_classes
+
+
+_extractor_classes = None
 
 
 def parse_video_id(url):
     patterns = [
-        r"(?:https?://)?(?:www\.)?(?:youtube\.com/watch\?v=|youtu\.be/)([a-zA-Z0-9_-]{11})",
-        r"(?:https?://)?(?:www\.)?youtube\.com/embed/([a-zA-Z0-9_-]{11})",
-        r"(?:https?://)?(?:www\.)?youtube\.com/share/([a-zA-Z0-9_-]{11})",
+        r"(?:https?://)?(?:(?:www|m|music)\.)?youtube\.com/watch\?(?:[^#]*&)?v=([a-zA-Z0-9_-]{11})",
+        r"(?:https?://)?youtu\.be/([a-zA-Z0-9_-]{11})",
+        r"(?:https?://)?(?:(?:www|m|music)\.)?youtube\.com/(?:embed|share|shorts|live|v)/([a-zA-Z0-9_-]{11})",
+        r"(?:https?://)?(?:www\.)?youtube-nocookie\.com/embed/([a-zA-Z0-9_-]{11})",
     ]
 
+    if not url:
+        return None
+
     for pattern in patterns:
-        match = re.match(pattern, url)
+        match = re.match(pattern, url.strip())
         if match:
             return match.group(1)
     return None
 
 
+def normalize_url(url):
+    video_id = parse_video_id(url)
+    if video_id:
+        return f"https://www.youtube.com/watch?v={video_id}"
+    return (url or "").strip()
+
+
+def load_extractors():
+    global _extractor_classes
+    if _extractor_classes is None:
+        _extractor_classes = [ie for ie in gen_extractor_classes() if ie.ie_key() != "Generic"]
+    return _extractor_classes
+
+
+def run_blocking(func, *args):
+    # Under gevent's monkey patching threads are greenlets, so blocking I/O goes to a real OS thread to keep the hub serving requests.
+    try:
+        from gevent import monkey, get_hub
+    except ImportError:
+        return func(*args)
+    if not monkey.is_module_patched("threading"):
+        return func(*args)
+    return get_hub().threadpool.apply(func, args)
+
+
+def _suitable_extractor(url):
+    for ie in load_extractors():
+        if not ie.suitable(url):
+            continue
+        try:
+            temp_id = ie.get_temp_id(url)
+        except Exception:
+            temp_id = None
+        return ie, temp_id
+    return None, None
+
+
+def extractor_cache_key(url):
+    if not url:
+        return None
+    ie, temp_id = _suitable_extractor(url)
+    if not temp_id:
+        return None
+    if parse_video_id(url):
+        return f"{ie.ie_key()}:{temp_id}"
+    return f"{ie.ie_key()}:{temp_id}:{url}"
+
+
+def archive_id(info):
+    video_id = info.get("id")
+    extractor_key = info.get("extractor_key") or info.get("ie_key")
+    if video_id and extractor_key:
+        return f"{extractor_key.lower()} {video_id}"
+    return archive_id_for_url(info.get("webpage_url") or info.get("url"))
+
+
+def archive_id_for_url(url):
+    if not url:
+        return None
+    video_id = parse_video_id(url)
+    if video_id:
+        return f"youtube {video_id}"
+    ie, temp_id = _suitable_extractor(url)
+    if not temp_id:
+        return None
+    return f"{ie.ie_key().lower()} {temp_id}"
+
+
+def is_throttle_error(error):
+    message = str(error)
+    return "HTTP Error 429" in message or "HTTP Error 403" in message
+
+
+def iter_playlist_entries(entries):
+    if isinstance(entries, yt_dlp.utils.PagedList):
+        page_number = 0
+        while True:
+            page = entries.getpage(page_number)
+            if not page:
+                return
+            yield from page
+            page_number += 1
+    else:
+        yield from entries or []
+
+
 class TrimDescriptionPP(yt_dlp.postprocessor.PostProcessor):
     def run(self, info):
         description = info.get("description", "")
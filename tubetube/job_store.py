@@ -0,0 +1,116 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+
+
+class JobStore:
+    TRANSIENT_FIELDS = {"video_format_logged"}
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.lock = threading.Lock()
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+        logging.info(f"Job store opened at: {db_path}")
+
+    def _create_schema(self):
+        with self.lock:
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS items (
+                    id INTEGER PRIMARY KEY,
+                    video_identifier TEXT,
+                    url TEXT,
+                    status TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_items_video_identifier ON items (video_identifier)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_items_url ON items (url)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_items_status ON items (status)")
+
+    def _serialise(self, item):
+        data = {key: value for key, value in item.items() if key not in self.TRANSIENT_FIELDS}
+        now = time.time()
+        return (item["id"], item.get("video_identifier"), item.get("url"), item.get("status", ""), json.dumps(data), now, now)
+
+    def save_item(self, item):
+        self.save_items([item])
+
+    def save_items(self, items):
+        rows = [self._serialise(item) for item in items]
+        if not rows:
+            return
+        try:
+            with self.lock:
+                self.conn.execute("BEGIN")
+                self.conn.executemany(
+                    """
+                    INSERT INTO items (id, video_identifier, url, status, data, created_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(id) DO UPDATE SET
+                        video_identifier = excluded.video_identifier,
+                        url = excluded.url,
+                        status = excluded.status,
+                        data = excluded.data,
+                        updated_at = excluded.updated_at
+                    """,
+                    rows,
+                )
+                self.conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            logging.error(f"Job store write error: {e}")
+            self._rollback()
+
+    def delete_items(self, item_ids):
+        if not item_ids:
+            return
+        try:
+            with self.lock:
+                self.conn.execute("BEGIN")
+                self.conn.executemany("DELETE FROM items WHERE id = ?", [(item_id,) for item_id in item_ids])
+                self.conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            logging.error(f"Job store delete error: {e}")
+            self._rollback()
+
+    def load_items(self):
+        try:
+            with self.lock:
+                rows = self.conn.execute("SELECT data FROM items ORDER BY id").fetchall()
+        except sqlite3.Error as e:
+            logging.error(f"Job store read error: {e}")
+            return []
+
+        items = []
+        for (data,) in rows:
+            try:
+                items.append(json.loads(data))
+            except ValueError as e:
+                logging.error(f"Skipping unreadable job record: {e}")
+        return items
+
+    def _rollback(self):
+        try:
+            with self.lock:
+                if self.conn.in_transaction:
+                    self.conn.execute("ROLLBACK")
+        except sqlite3.Error:
+            pass
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
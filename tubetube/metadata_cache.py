@@ -0,0 +1,128 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+import yt_dlp
+
+
+class MetadataCache:
+    def __init__(self, cache_dir, max_bytes, video_ttl, playlist_ttl):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.ttls = {"video": video_ttl, "playlist": playlist_ttl}
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_index()
+        logging.info(f"Metadata cache: {len(self.entries)} entries, {self.total_bytes} bytes in {cache_dir}")
+
+    def _load_index(self):
+        found = []
+        for entry in os.scandir(self.cache_dir):
+            if not entry.is_file() or not entry.name.endswith(".json"):
+                continue
+            kind = entry.name.split("-", 1)[0]
+            if kind not in self.ttls:
+                continue
+            stat = entry.stat()
+            found.append((stat.st_mtime, entry.name, kind, stat.st_size))
+
+        for stored_at, name, kind, size in sorted(found):
+            self.entries[name] = (kind, stored_at, size)
+            self.total_bytes += size
+        with self.lock:
+            self._evict_locked()
+
+    def _file_name(self, key, kind):
+        return f"{kind}-{hashlib.sha1(key.encode('utf-8')).hexdigest()}.json"
+
+    def _lookup(self, key):
+        now = time.time()
+        with self.lock:
+            for kind, ttl in self.ttls.items():
+                name = self._file_name(key, kind)
+                entry = self.entries.get(name)
+                if entry is None:
+                    continue
+                if now - entry[1] > ttl:
+                    self._remove_locked(name)
+                    continue
+                self.entries.move_to_end(name)
+                self.hits += 1
+                return os.path.join(self.cache_dir, name)
+            self.misses += 1
+            return None
+
+    def get_path(self, key):
+        if not key:
+            return None
+        return self._lookup(key)
+
+    def get(self, key):
+        path = self.get_path(key)
+        if not path:
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Discarding unreadable metadata cache entry {path}: {e}")
+            with self.lock:
+                self._remove_locked(os.path.basename(path))
+            return None
+
+    def put(self, key, info, kind="video"):
+        if not key or kind not in self.ttls:
+            return
+        name = self._file_name(key, kind)
+        path = os.path.join(self.cache_dir, name)
+        try:
+            data = json.dumps(yt_dlp.YoutubeDL.sanitize_info(info), ensure_ascii=False).encode("utf-8")
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(temp_path, "wb") as file:
+                file.write(data)
+            os.replace(temp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            logging.warning(f"Unable to cache metadata for {key}: {e}")
+            return
+
+        with self.lock:
+            previous = self.entries.pop(name, None)
+            if previous:
+                self.total_bytes -= previous[2]
+            self.entries[name] = (kind, time.time(), len(data))
+            self.total_bytes += len(data)
+            self._evict_locked()
+
+    def _evict_locked(self):
+        while self.entries and self.total_bytes > self.max_bytes:
+            name = next(iter(self.entries))
+            self._remove_locked(name)
+            self.evictions += 1
+
+    def _remove_locked(self, name):
+        entry = self.entries.pop(name, None)
+        if entry:
+            self.total_bytes -= entry[2]
+        try:
+            os.remove(os.path.join(self.cache_dir, name))
+        except OSError:
+            pass
+
+    def stats(self):
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "bytes": self.total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,165 @@
+import json
+import bisect
+import threading
+
+
+DEFAULT_BUCKETS = (0.1, 0.5, 1, 2.5, 5, 15, 30, 60, 120, 300, 900, 1800, 3600)
+SHARD_COUNT = 16
+EMIT_SIZE_SAMPLE_RATE = 16
+
+
+def _format_labels(label_names, label_values, extra=None):
+    pairs = list(zip(label_names, label_values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    escaped = []
+    for name, value in pairs:
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        escaped.append(f'{name}="{value}"')
+    return "{" + ",".join(escaped) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+class ShardedMetric:
+    metric_type = None
+
+    def __init__(self, name, help_text, label_names=()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        # A fixed set of shards picked by thread ident, so short-lived threads and greenlets don't add new ones.
+        self.shards = [({}, threading.Lock()) for _ in range(SHARD_COUNT)]
+
+    def _shard(self):
+        return self.shards[hash((threading.get_ident(),)) % SHARD_COUNT]
+
+    def _snapshots(self):
+        snapshots = []
+        for values, lock in self.shards:
+            with lock:
+                snapshots.append({label_values: list(value) if isinstance(value, list) else value for label_values, value in values.items()})
+        return snapshots
+
+
+class Counter(ShardedMetric):
+    metric_type = "counter"
+
+    def inc(self, *label_values, amount=1):
+        values, lock = self._shard()
+        with lock:
+            values[label_values] = values.get(label_values, 0) + amount
+
+    def samples(self):
+        totals = {}
+        for shard in self._snapshots():
+            for label_values, value in shard.items():
+                totals[label_values] = totals.get(label_values, 0) + value
+        return [(self.name, _format_labels(self.label_names, label_values), value) for label_values, value in sorted(totals.items())]
+
+
+class Histogram(ShardedMetric):
+    metric_type = "histogram"
+
+    def __init__(self, name, help_text, label_names=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, label_names)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, *label_values):
+        bucket = bisect.bisect_left(self.buckets, value)
+        values, lock = self._shard()
+        with lock:
+            entry = values.get(label_values)
+            if entry is None:
+                entry = [0] * (len(self.buckets) + 1) + [0.0]
+                values[label_values] = entry
+            entry[bucket] += 1
+            entry[-1] += value
+
+    def samples(self):
+        totals = {}
+        for shard in self._snapshots():
+            for label_values, entry in shard.items():
+                total = totals.setdefault(label_values, [0] * len(entry))
+                for index, value in enumerate(entry):
+                    total[index] += value
+
+        samples = []
+        for label_values, total in sorted(totals.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), total[:-1]):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", _format_labels(self.label_names, label_values, ("le", _format_value(float(bound)))), cumulative))
+            samples.append((f"{self.name}_sum", _format_labels(self.label_names, label_values), round(total[-1], 6)))
+            samples.append((f"{self.name}_count", _format_labels(self.label_names, label_values), cumulative))
+        return samples
+
+
+class CallbackMetric:
+    def __init__(self, name, help_text, metric_type, label_names, collect):
+        self.name = name
+        self.help_text = help_text
+        self.metric_type = metric_type
+        self.label_names = tuple(label_names)
+        self.collect = collect
+
+    def samples(self):
+        values = self.collect()
+        if not isinstance(values, dict):
+            values = {(): values}
+        return [(self.name, _format_labels(self.label_names, label_values), value) for label_values, value in sorted(values.items())]
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics = []
+
+    def counter(self, name, help_text, label_names=()):
+        return self._register(Counter(name, help_text, label_names))
+
+    def histogram(self, name, help_text, label_names=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, help_text, label_names, buckets))
+
+    def gauge_callback(self, name, help_text, collect, label_names=()):
+        return self._register(CallbackMetric(name, help_text, "gauge", label_names, collect))
+
+    def counter_callback(self, name, help_text, collect, label_names=()):
+        return self._register(CallbackMetric(name, help_text, "counter", label_names, collect))
+
+    def _register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def instrument_emit(self, socketio):
+        emits = self.counter("tubetube_socket_emits_total", "Socket.IO events emitted.", ("event",))
+        emitted_bytes = self.counter("tubetube_socket_emit_bytes_total", "Estimated JSON payload bytes of emitted Socket.IO events.", ("event",))
+        emit = socketio.emit
+        emit_counts = {}
+
+        def counted_emit(event, *args, **kwargs):
+            emits.inc(event)
+            # Serialising every payload twice is too costly for large snapshots, measure one in EMIT_SIZE_SAMPLE_RATE and scale it up.
+            count = emit_counts.get(event, 0)
+            emit_counts[event] = count + 1
+            if args and count % EMIT_SIZE_SAMPLE_RATE == 0:
+                emitted_bytes.inc(event, amount=len(json.dumps(args[0], separators=(",", ":"), default=str)) * EMIT_SIZE_SAMPLE_RATE)
+            return emit(event, *args, **kwargs)
+
+        socketio.emit = counted_emit
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.metric_type}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{labels} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,78 @@
+import time
+import queue
+import logging
+import threading
+import yt_dlp
+
+
+class DeferredPostProcessingYDL(yt_dlp.YoutubeDL):
+    def __init__(self, params=None, defer_post_processing=False, **kwargs):
+        super().__init__(params, **kwargs)
+        self.defer_post_processing = defer_post_processing
+        self.deferred_post_processing = []
+
+    def post_process(self, filename, info, files_to_move=None):
+        if not self.defer_post_processing:
+            return super().post_process(filename, info, files_to_move)
+        info["filepath"] = filename
+        self.deferred_post_processing.append((filename, dict(info), files_to_move))
+        return info
+
+    def run_deferred_post_processing(self):
+        while self.deferred_post_processing:
+            filename, info, files_to_move = self.deferred_post_processing.pop(0)
+            super().post_process(filename, info, files_to_move)
+
+
+class PostProcessingPool:
+    def __init__(self, worker_count=2, queue_size=8, name="PostProcessor"):
+        self.jobs = queue.Queue(maxsize=max(queue_size, 1))
+        self.stats_lock = threading.Lock()
+        self.active = 0
+        self.completed = 0
+        self.total_seconds = 0.0
+        self.total_wait_seconds = 0.0
+
+        for i in range(max(worker_count, 1)):
+            worker = threading.Thread(target=self._run, daemon=True, name=f"{name}-{i}")
+            worker.start()
+        logging.info(f"Started {max(worker_count, 1)} {name} workers with a queue of {self.jobs.maxsize}.")
+
+    def submit(self, func, *args):
+        self.jobs.put((func, args, time.monotonic()))
+
+    def try_submit(self, func, *args):
+        try:
+            self.jobs.put_nowait((func, args, time.monotonic()))
+        except queue.Full:
+            return False
+        return True
+
+    def _run(self):
+        while True:
+            func, args, submitted_at = self.jobs.get()
+            started_at = time.monotonic()
+            with self.stats_lock:
+                self.active += 1
+            try:
+                func(*args)
+            except Exception as e:
+                logging.error(f"Post-processing job failed: {e}")
+            finally:
+                elapsed = time.monotonic() - started_at
+                with self.stats_lock:
+                    self.active -= 1
+                    self.completed += 1
+                    self.total_seconds += elapsed
+                    self.total_wait_seconds += started_at - submitted_at
+                self.jobs.task_done()
+
+    def stats(self):
+        with self.stats_lock:
+            return {
+                "queue_depth": self.jobs.qsize(),
+                "active": self.active,
+                "completed": self.completed,
+                "average_seconds": self.total_seconds / self.completed if self.completed else 0.0,
+                "average_wait_seconds": self.total_wait_seconds / self.completed if self.completed else 0.0,
+            }
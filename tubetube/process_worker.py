@@ -0,0 +1,162 @@
+import os
+import sys
+import json
+import time
+import queue
+import logging
+import threading
+import subprocess
+
+
+PROGRESS_INTERVAL = 0.1
+PROGRESS_FIELDS = ("status", "downloaded_bytes", "total_bytes", "total_bytes_estimate", "speed", "eta", "elapsed", "fragment_index", "fragment_count", "filename", "tmpfilename")
+INFO_FIELDS = ("id", "title", "format_id", "format_note", "width", "height", "fps", "ext", "vcodec", "acodec", "is_live")
+
+
+class WorkerProcessError(Exception):
+    def __init__(self, error_type, message):
+        super().__init__(message)
+        self.error_type = error_type
+
+
+class DownloadProcess:
+    def __init__(self, job):
+        self.process = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            bufsize=1,
+        )
+        self.messages = queue.Queue()
+        reader = threading.Thread(target=self._read_messages, daemon=True, name=f"DownloadProcess-{self.process.pid}")
+        reader.start()
+        self.send(job)
+
+    def _read_messages(self):
+        try:
+            for line in self.process.stdout:
+                try:
+                    self.messages.put(json.loads(line))
+                except ValueError:
+                    logging.warning(f"Ignoring malformed message from download process {self.process.pid}: {line.strip()}")
+        finally:
+            self.messages.put(None)
+
+    def send(self, message):
+        try:
+            self.process.stdin.write(json.dumps(message) + "\n")
+            self.process.stdin.flush()
+        except (OSError, ValueError):
+            pass
+
+    def receive(self, timeout):
+        return self.messages.get(timeout=timeout)
+
+    def exit_code(self):
+        try:
+            return self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            return None
+
+    def stop(self, grace_seconds=5):
+        if self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=grace_seconds)
+            except subprocess.TimeoutExpired:
+                logging.warning(f"Killing download process {self.process.pid}")
+                self.process.kill()
+                self.process.wait()
+        for stream in (self.process.stdin, self.process.stdout):
+            try:
+                stream.close()
+            except (OSError, ValueError):
+                pass
+
+
+def _slim_progress(d):
+    data = {key: d.get(key) for key in PROGRESS_FIELDS}
+    info = d.get("info_dict") or {}
+    data["info_dict"] = {key: info.get(key) for key in INFO_FIELDS}
+    return data
+
+
+def main():
+    ipc_out = os.fdopen(os.dup(sys.stdout.fileno()), "w", encoding="utf-8", buffering=1)
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    logging.basicConfig(level=logging.INFO, format=f"%(asctime)s - %(levelname)s - [pid {os.getpid()}] %(message)s")
+
+    import yt_dlp
+    import helpers
+    from settings import DownloadCancelledException
+    from bandwidth import BandwidthGovernor
+    from tracing import ProfileSession, install_ffmpeg_timing, set_ffmpeg_listener
+
+    send_lock = threading.Lock()
+    cancelled = threading.Event()
+    bandwidth = BandwidthGovernor()
+    last_sent = {"at": 0.0}
+
+    def send(message):
+        with send_lock:
+            ipc_out.write(json.dumps(message) + "\n")
+
+    def read_commands():
+        for line in sys.stdin:
+            try:
+                command = json.loads(line)
+            except ValueError:
+                continue
+            if command.get("type") == "cancel":
+                cancelled.set()
+            elif command.get("type") == "rate":
+                bandwidth.set_limit(int(command.get("bytes_per_second") or 0))
+        cancelled.set()
+
+    def progress_hook(d):
+        if cancelled.is_set():
+            raise DownloadCancelledException("Cancelled")
+        now = time.monotonic()
+        if d["status"] != "downloading" or now - last_sent["at"] >= PROGRESS_INTERVAL:
+            last_sent["at"] = now
+            send({"type": "progress", "data": _slim_progress(d)})
+        if d["status"] == "downloading":
+            wait_seconds = bandwidth.throttle("download", d.get("tmpfilename") or d.get("filename"), d.get("downloaded_bytes") or 0)
+            if wait_seconds > 0 and cancelled.wait(wait_seconds):
+                raise DownloadCancelledException("Cancelled")
+
+    def postprocessor_hook(d):
+        if cancelled.is_set():
+            raise DownloadCancelledException("Cancelled")
+        send({"type": "postprocess", "status": d.get("status"), "postprocessor": d.get("postprocessor")})
+
+    job = json.loads(sys.stdin.readline())
+    commands = threading.Thread(target=read_commands, daemon=True, name="Commands")
+    commands.start()
+
+    ydl_opts = job["ydl_opts"]
+    ydl_opts["progress_hooks"] = [progress_hook]
+    ydl_opts["postprocessor_hooks"] = [postprocessor_hook]
+    install_ffmpeg_timing()
+    set_ffmpeg_listener(lambda postprocessor, seconds: send({"type": "ffmpeg", "postprocessor": postprocessor, "seconds": seconds}))
+    try:
+        with ProfileSession(job.get("profile_path")), yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            if job.get("trim_metadata"):
+                ydl.add_post_processor(helpers.TrimDescriptionPP(), when="before_dl")
+            if job.get("info_file"):
+                result = ydl.download_with_info_file(job["info_file"])
+            else:
+                result = ydl.download([job["url"]])
+        send({"type": "done", "result": result})
+    except DownloadCancelledException:
+        send({"type": "cancelled"})
+    except Exception as e:
+        send({"type": "error", "error_type": type(e).__name__, "message": str(e)})
+    finally:
+        ipc_out.flush()
+
+
+if __name__ == "__main__":
+    main()
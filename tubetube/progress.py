@@ -0,0 +1,103 @@
+import time
+import logging
+import threading
+from yt_dlp.utils import format_bytes, formatSeconds
+
+
+class ProgressState:
+    __slots__ = ("item", "downloaded_bytes", "total_bytes", "speed", "eta", "elapsed", "fragment_index", "fragment_count", "is_live", "rate_limit", "finished", "updated_at", "published_at")
+
+    def __init__(self, item):
+        self.item = item
+        self.downloaded_bytes = 0
+        self.total_bytes = None
+        self.speed = None
+        self.eta = None
+        self.elapsed = None
+        self.fragment_index = None
+        self.fragment_count = None
+        self.is_live = False
+        self.rate_limit = 0
+        self.finished = False
+        self.updated_at = 0.0
+        self.published_at = 0.0
+
+    def update(self, d):
+        self.downloaded_bytes = d.get("downloaded_bytes") or 0
+        self.total_bytes = d.get("total_bytes") or d.get("total_bytes_estimate")
+        self.speed = d.get("speed")
+        self.eta = d.get("eta")
+        self.elapsed = d.get("elapsed")
+        self.fragment_index = d.get("fragment_index")
+        self.fragment_count = d.get("fragment_count")
+        self.is_live = bool((d.get("info_dict") or {}).get("is_live"))
+        self.updated_at = time.monotonic()
+
+    def progress_message(self):
+        if self.is_live:
+            elapsed = formatSeconds(int(self.elapsed)) if self.elapsed is not None else "-"
+            return f"Frag: {self.fragment_index or 1} ({elapsed})"
+
+        if self.total_bytes:
+            percent = f"{min(self.downloaded_bytes / self.total_bytes * 100, 100):.1f}%"
+        elif self.fragment_index and self.fragment_count:
+            percent = f"{min(self.fragment_index / self.fragment_count * 100, 100):.1f}%"
+        else:
+            percent = format_bytes(self.downloaded_bytes)
+        speed = f"{format_bytes(self.speed)}/s" if self.speed else "Unknown speed"
+        if self.rate_limit:
+            return f"{percent} at {speed} (limit {format_bytes(self.rate_limit)}/s)"
+        return f"{percent} at {speed}"
+
+    def summary(self):
+        return {
+            "progress": self.progress_message(),
+            "downloaded_bytes": self.downloaded_bytes,
+            "total_bytes": self.total_bytes,
+            "speed": self.speed,
+            "eta": self.eta,
+            "rate_limit": self.rate_limit,
+        }
+
+
+class ProgressTicker:
+    def __init__(self, socketio, interval=0.5):
+        self.socketio = socketio
+        self.interval = interval
+        self.states = {}
+
+        ticker = threading.Thread(target=self._run, daemon=True, name="ProgressTicker")
+        ticker.start()
+        logging.info(f"Publishing download progress every {interval}s.")
+
+    def track(self, download_id, item):
+        state = ProgressState(item)
+        self.states[download_id] = state
+        return state
+
+    def untrack(self, download_id):
+        self.states.pop(download_id, None)
+
+    def total_speed(self):
+        return sum(state.speed or 0 for state in list(self.states.values()) if not state.finished)
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.publish()
+            except Exception as e:
+                logging.error(f"Error publishing progress: {e}")
+
+    def publish(self):
+        changed = {}
+        for download_id, state in list(self.states.items()):
+            if state.finished or state.updated_at <= state.published_at:
+                continue
+            state.published_at = state.updated_at
+            summary = state.summary()
+            state.item["progress"] = summary["progress"]
+            changed[download_id] = summary
+
+        if changed:
+            self.socketio.emit("download_progress", {"items": changed})
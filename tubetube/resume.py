@@ -0,0 +1,62 @@
+import os
+import json
+import time
+import logging
+import threading
+
+
+class ResumeManifest:
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.entries = {}
+
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                self.entries = {int(download_id): entry for download_id, entry in json.load(file).items()}
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, AttributeError) as e:
+            logging.warning(f"Ignoring unreadable resume manifest {path}: {e}")
+        if self.entries:
+            logging.info(f"Resume manifest lists {len(self.entries)} interrupted downloads.")
+
+    def add(self, download_id, item, file_stem):
+        with self.lock:
+            self.entries[download_id] = {
+                "file_stem": file_stem,
+                "title": item.get("title"),
+                "url": item.get("url"),
+                "started_at": time.time(),
+            }
+            self._write_locked()
+
+    def remove(self, download_id):
+        with self.lock:
+            if self.entries.pop(download_id, None) is not None:
+                self._write_locked()
+
+    def retain(self, download_ids):
+        with self.lock:
+            stale = [download_id for download_id in self.entries if download_id not in download_ids]
+            for download_id in stale:
+                del self.entries[download_id]
+            if stale:
+                self._write_locked()
+
+    def download_ids(self):
+        with self.lock:
+            return set(self.entries)
+
+    def file_stems(self):
+        with self.lock:
+            return {entry["file_stem"] for entry in self.entries.values() if entry.get("file_stem")}
+
+    def _write_locked(self):
+        temp_path = f"{self.path}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump({str(download_id): entry for download_id, entry in self.entries.items()}, file, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logging.error(f"Unable to write resume manifest: {e}")
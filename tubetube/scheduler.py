@@ -0,0 +1,135 @@
+import time
+import heapq
+import logging
+import itertools
+import threading
+from collections import OrderedDict
+
+
+class DownloadScheduler:
+    def __init__(self, folder_limits=None):
+        self.condition = threading.Condition()
+        self.lanes = OrderedDict()
+        self.sequence = itertools.count()
+        self.folder_limits = dict(folder_limits or {})
+        self.folder_active = {}
+        self.pending = {}
+        self.active = {}
+        self.top_priority = 0
+
+        for folder, limit in self.folder_limits.items():
+            logging.info(f"Folder {folder} limited to {limit} concurrent downloads.")
+
+    def set_folder_limits(self, folder_limits):
+        with self.condition:
+            if folder_limits == self.folder_limits:
+                return
+            self.folder_limits = dict(folder_limits)
+            self.condition.notify_all()
+        logging.info(f"Folder concurrency limits set to: {folder_limits}")
+
+    def put(self, download_id, lane=None, priority=0, folder=None):
+        with self.condition:
+            lane_entries = self.lanes.setdefault(lane, [])
+            heapq.heappush(lane_entries, (-priority, next(self.sequence), download_id, folder))
+            self.pending[download_id] = lane
+            self.top_priority = max(self.top_priority, priority)
+            self.condition.notify()
+
+    def get(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.condition:
+            while True:
+                download_id = self._pop_next_locked()
+                if download_id is not None:
+                    return download_id
+                if deadline is None:
+                    self.condition.wait()
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self.condition.wait(remaining)
+
+    def _pop_next_locked(self):
+        best_lane = None
+        best_entry = None
+        for lane, lane_entries in self.lanes.items():
+            if not lane_entries:
+                continue
+            entry = lane_entries[0]
+            if self._folder_is_full(entry[3]):
+                continue
+            if best_entry is None or entry[0] < best_entry[0]:
+                best_lane = lane
+                best_entry = entry
+
+        if best_entry is None:
+            return None
+
+        lane_entries = self.lanes[best_lane]
+        heapq.heappop(lane_entries)
+        if lane_entries:
+            self.lanes.move_to_end(best_lane)
+        else:
+            del self.lanes[best_lane]
+
+        download_id, folder = best_entry[2], best_entry[3]
+        self.pending.pop(download_id, None)
+        self.active[download_id] = folder
+        self.folder_active[folder] = self.folder_active.get(folder, 0) + 1
+        return download_id
+
+    def _folder_is_full(self, folder):
+        limit = self.folder_limits.get(folder)
+        return bool(limit) and self.folder_active.get(folder, 0) >= limit
+
+    def task_done(self, download_id):
+        with self.condition:
+            if download_id not in self.active:
+                return
+            folder = self.active.pop(download_id)
+            self.folder_active[folder] -= 1
+            if folder in self.folder_limits:
+                self.condition.notify_all()
+
+    def discard(self, download_ids):
+        with self.condition:
+            for download_id in download_ids:
+                if download_id not in self.pending:
+                    continue
+                lane = self.pending.pop(download_id)
+                if lane not in self.lanes:
+                    continue
+                lane_entries = [entry for entry in self.lanes[lane] if entry[2] != download_id]
+                heapq.heapify(lane_entries)
+                if lane_entries:
+                    self.lanes[lane] = lane_entries
+                else:
+                    del self.lanes[lane]
+
+    def move_to_front(self, download_ids):
+        moved = {}
+        with self.condition:
+            for download_id in reversed(list(download_ids)):
+                if download_id not in self.pending:
+                    continue
+                lane = self.pending[download_id]
+                self.top_priority += 1
+                lane_entries = self.lanes[lane]
+                for index, entry in enumerate(lane_entries):
+                    if entry[2] == download_id:
+                        lane_entries[index] = (-self.top_priority, entry[1], download_id, entry[3])
+                        break
+                heapq.heapify(lane_entries)
+                moved[download_id] = self.top_priority
+            if moved:
+                self.condition.notify_all()
+        return moved
+
+    def qsize(self):
+        with self.condition:
+            return len(self.pending)
+
+    def empty(self):
+        return self.qsize() == 0
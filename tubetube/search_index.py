@@ -0,0 +1,268 @@
+import os
+import re
+import time
+import queue
+import sqlite3
+import logging
+import threading
+import helpers
+from vtt_tool import VttSubtitleTool
+
+
+HIGHLIGHT_START = "\x02"
+HIGHLIGHT_END = "\x03"
+TRIGRAM_MIN_LENGTH = 3
+SNIPPET_WORDS = 24
+
+
+def subtitle_title(file_name):
+    stem = os.path.splitext(file_name)[0]
+    title, _, language = stem.rpartition(".")
+    return title if title and language and len(language) <= 16 and " " not in language else stem
+
+
+def deep_link(url, start_ms):
+    if not url or not start_ms:
+        return url
+    separator = "&" if "?" in url else "?"
+    return f"{url}{separator}t={start_ms // 1000}s"
+
+
+class SearchIndex:
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self.tool = VttSubtitleTool()
+        self.jobs = queue.Queue()
+        self.trigram = helpers.run_blocking(self._open)
+        threading.Thread(target=self._run, daemon=True, name="SearchIndexer").start()
+        logging.info(f"Search index opened at: {db_path} ({'trigram' if self.trigram else 'unicode61'} tokenizer)")
+
+    def _open(self):
+        db_dir = os.path.dirname(self.db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        return self._create_schema()
+
+    def _create_schema(self):
+        with self.lock:
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS documents (
+                    id INTEGER PRIMARY KEY,
+                    path TEXT NOT NULL UNIQUE,
+                    mtime_ns INTEGER,
+                    size INTEGER,
+                    video_identifier TEXT,
+                    title TEXT,
+                    folder TEXT,
+                    url TEXT,
+                    indexed_at REAL NOT NULL
+                )
+                """
+            )
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS cues (
+                    id INTEGER PRIMARY KEY,
+                    document_id INTEGER NOT NULL,
+                    start_ms INTEGER,
+                    end_ms INTEGER
+                )
+                """
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_cues_document_id ON cues (document_id)")
+            row = self.conn.execute("SELECT sql FROM sqlite_master WHERE name = 'entries'").fetchone()
+            if row:
+                return "trigram" in row[0]
+            try:
+                self.conn.execute("CREATE VIRTUAL TABLE entries USING fts5(text, title, folder, tokenize='trigram')")
+                return True
+            except sqlite3.OperationalError:
+                self.conn.execute("CREATE VIRTUAL TABLE entries USING fts5(text, title, folder)")
+                return False
+
+    def enqueue_file(self, path, title=None, folder=None, url=None, video_identifier=None):
+        self.jobs.put((self.index_file, (path, title, folder, url, video_identifier)))
+
+    def enqueue_scan(self, root):
+        self.jobs.put((self.scan, (root,)))
+
+    def _run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            func, args = job
+            try:
+                func(*args)
+            except Exception as e:
+                logging.error(f"Search indexing failed: {e}")
+            finally:
+                self.jobs.task_done()
+
+    def scan(self, root):
+        started = time.monotonic()
+        root = os.path.abspath(root)
+        with self.lock:
+            known = dict(self.conn.execute("SELECT path, id FROM documents WHERE path LIKE ? ESCAPE '\\'", (self._like_prefix(root),)).fetchall())
+        indexed = 0
+        for path in self.tool.list_vtt_files(root, recursive=True):
+            known.pop(path, None)
+            folder = os.path.relpath(os.path.dirname(path), root).replace(os.sep, "/")
+            if self.index_file(path, folder="" if folder == "." else folder):
+                indexed += 1
+        for document_id in known.values():
+            self._delete_document(document_id)
+        logging.info(f"Search index scan of {root}: {indexed} files indexed, {len(known)} removed in {time.monotonic() - started:.1f}s.")
+
+    def _like_prefix(self, root):
+        return f"{self._escape_like(root.rstrip(os.sep))}{os.sep}%"
+
+    def _escape_like(self, value):
+        return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+    def index_file(self, path, title=None, folder=None, url=None, video_identifier=None):
+        path = os.path.abspath(path)
+        try:
+            stat = os.stat(path)
+        except OSError as e:
+            logging.warning(f"Cannot index {path}: {e}")
+            return False
+
+        with self.lock:
+            row = self.conn.execute("SELECT id, mtime_ns, size, title, folder, url, video_identifier FROM documents WHERE path = ?", (path,)).fetchone()
+        if row:
+            if row[1] == stat.st_mtime_ns and row[2] == stat.st_size and (url is None or row[5] == url):
+                return False
+            title, folder, url, video_identifier = title or row[3], folder or row[4], url or row[5], video_identifier or row[6]
+        title = title or subtitle_title(os.path.basename(path))
+        cues = [(cue.start, cue.end, cue.text) for cue in self.tool.merge_cues(self.tool.iter_cues_from_file(path))]
+
+        try:
+            with self.lock:
+                self.conn.execute("BEGIN")
+                if row:
+                    self._delete_document_locked(row[0])
+                document_id = self.conn.execute(
+                    "INSERT INTO documents (path, mtime_ns, size, video_identifier, title, folder, url, indexed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (path, stat.st_mtime_ns, stat.st_size, video_identifier, title, folder, url, time.time()),
+                ).lastrowid
+                first_id = self.conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM cues").fetchone()[0]
+                entries = [(first_id, None, None, "", title, folder or "")]
+                entries.extend((cue_id, start_ms, end_ms, text, "", "") for cue_id, (start_ms, end_ms, text) in enumerate(cues, first_id + 1))
+                self.conn.executemany("INSERT INTO cues (id, document_id, start_ms, end_ms) VALUES (?, ?, ?, ?)", [(entry[0], document_id, entry[1], entry[2]) for entry in entries])
+                self.conn.executemany("INSERT INTO entries (rowid, text, title, folder) VALUES (?, ?, ?, ?)", [(entry[0], entry[3], entry[4], entry[5]) for entry in entries])
+                self.conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            logging.error(f"Search index write error for {path}: {e}")
+            self._rollback()
+            return False
+        return True
+
+    def _delete_document(self, document_id):
+        try:
+            with self.lock:
+                self.conn.execute("BEGIN")
+                self._delete_document_locked(document_id)
+                self.conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            logging.error(f"Search index delete error: {e}")
+            self._rollback()
+
+    def _delete_document_locked(self, document_id):
+        self.conn.execute("DELETE FROM entries WHERE rowid IN (SELECT id FROM cues WHERE document_id = ?)", (document_id,))
+        self.conn.execute("DELETE FROM cues WHERE document_id = ?", (document_id,))
+        self.conn.execute("DELETE FROM documents WHERE id = ?", (document_id,))
+
+    def search(self, query, limit=50):
+        terms = [term for term in str(query or "").split() if term]
+        if not terms:
+            return []
+        limit = max(1, min(int(limit), 500))
+        select = """
+            SELECT c.start_ms, c.end_ms, d.id, d.title, d.folder, d.url, d.path, d.video_identifier,
+                   {snippet}, {score}
+            FROM entries
+            JOIN cues c ON c.id = entries.rowid
+            JOIN documents d ON d.id = c.document_id
+        """
+        like_scan = self.trigram and any(len(term) < TRIGRAM_MIN_LENGTH for term in terms)
+        if like_scan:
+            # Trigram indexes cannot match terms shorter than three characters, fall back to a scan. Rank by how often
+            # the terms occur, a title match counting like the title weight in bm25, and highlight in Python.
+            score = " + ".join(
+                "(length(entries.text) - length(replace(lower(entries.text), ?, ''))) / length(?) + 5 * (instr(lower(entries.title), ?) > 0)"
+                for _ in terms
+            )
+            conditions = " AND ".join("(entries.text LIKE ? ESCAPE '\\' OR entries.title LIKE ? ESCAPE '\\')" for _ in terms)
+            params = [term.lower() for term in terms for _ in range(3)]
+            params += [value for term in terms for value in (f"%{self._escape_like(term)}%",) * 2]
+            sql = f"{select.format(snippet='entries.text', score=f'-({score})')} WHERE {conditions} ORDER BY 10, d.id, c.start_ms LIMIT ?"
+        else:
+            match = " ".join('"' + term.replace('"', '""') + '"' + ("" if self.trigram else "*") for term in terms)
+            params = [match]
+            snippet = f"snippet(entries, 0, '{HIGHLIGHT_START}', '{HIGHLIGHT_END}', '…', {SNIPPET_WORDS})"
+            sql = f"{select.format(snippet=snippet, score='bm25(entries, 1.0, 5.0, 2.0)')} WHERE entries MATCH ? ORDER BY 10 LIMIT ?"
+        try:
+            with self.lock:
+                rows = self.conn.execute(sql, (*params, limit)).fetchall()
+        except sqlite3.Error as e:
+            logging.error(f"Search index read error: {e}")
+            return []
+
+        hits = []
+        for start_ms, end_ms, document_id, title, folder, url, path, video_identifier, snippet, score in rows:
+            if like_scan:
+                snippet = self._highlight(snippet or "", terms)
+            hits.append({
+                "document_id": document_id,
+                "title": title,
+                "folder": folder,
+                "path": path,
+                "video_identifier": video_identifier,
+                "start_ms": start_ms or 0,
+                "end_ms": end_ms or 0,
+                "snippet": snippet or title,
+                "score": round(-score, 4),
+                "url": url,
+                "link": deep_link(url, start_ms),
+            })
+        return hits
+
+    def _highlight(self, text, terms):
+        # Same shape as snippet(): a window of words around the first match, with the terms marked and "…" where cut.
+        pattern = re.compile("|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True)), re.IGNORECASE)
+        words = text.split()
+        first = next((index for index, word in enumerate(words) if pattern.search(word)), 0)
+        start = max(min(first - SNIPPET_WORDS // 4, len(words) - SNIPPET_WORDS), 0)
+        window = " ".join(words[start : start + SNIPPET_WORDS])
+        highlighted = pattern.sub(lambda match: f"{HIGHLIGHT_START}{match.group(0)}{HIGHLIGHT_END}", window)
+        return f"{'…' if start else ''}{highlighted}{'…' if start + SNIPPET_WORDS < len(words) else ''}"
+
+    def stats(self):
+        try:
+            with self.lock:
+                documents = self.conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+                cues = self.conn.execute("SELECT COUNT(*) FROM cues").fetchone()[0]
+        except sqlite3.Error as e:
+            logging.error(f"Search index read error: {e}")
+            return {"documents": 0, "cues": 0, "queued": self.jobs.qsize()}
+        return {"documents": documents, "cues": cues - documents, "queued": self.jobs.qsize()}
+
+    def _rollback(self):
+        try:
+            with self.lock:
+                if self.conn.in_transaction:
+                    self.conn.execute("ROLLBACK")
+        except sqlite3.Error:
+            pass
+
+    def close(self):
+        self.jobs.put(None)
+        with self.lock:
+            self.conn.close()
@@ -48,11 +48,7 @@ class Settings:
 
         self.folder_locations = self._load_settings()
         self.audio_locations, self.video_locations = self._categorise_locations()
-
-        all_folders = set(self.audio_locations.keys()).union(set(self.video_locations.keys()))
-
-        for folder_name in all_folders:
-            os.makedirs(os.path.join(self.data_folder, folder_name), exist_ok=True)
+        self._create_folders()
 
         os.makedirs(self.config_folder, exist_ok=True)
 
@@ -66,18 +62,51 @@ class Settings:
             return Config.DEFAULT_FOLDER_LOCATIONS
 
         try:
-            with open(self.settings_file_path, "r") as file:
-                return yaml.safe_load(file) or Config.DEFAULT_FOLDER_LOCATIONS
+            return self._read_settings_file()
 
-        except yaml.YAMLError as e:
+        except (yaml.YAMLError, ValueError) as e:
             logging.error(f"YAML loading error: {e}")
             return Config.DEFAULT_FOLDER_LOCATIONS
 
-    def _categorise_locations(self):
+    def _read_settings_file(self):
+        with open(self.settings_file_path, "r") as file:
+            folder_locations = yaml.safe_load(file) or Config.DEFAULT_FOLDER_LOCATIONS
+
+        if not isinstance(folder_locations, dict):
+            raise ValueError("settings.yaml must map folder names to download settings")
+        for folder_name, download_settings in folder_locations.items():
+            if not isinstance(download_settings, dict):
+                raise ValueError(f"Folder {folder_name} must map to a set of download settings")
+        return folder_locations
+
+    def reload_settings(self):
+        try:
+            folder_locations = self._read_settings_file()
+        except (OSError, ValueError, yaml.YAMLError) as e:
+            logging.error(f"Ignoring invalid {self.settings_file_path}, keeping the current folders: {e}")
+            return False
+        if folder_locations == self.folder_locations:
+            return False
+
+        audio_locations, video_locations = self._categorise_locations(folder_locations)
+        self._create_folders(audio_locations, video_locations)
+        self.folder_locations, self.audio_locations, self.video_locations = folder_locations, audio_locations, video_locations
+        logging.info(f"Reloaded folder locations: {list(folder_locations)}")
+        return True
+
+    def _create_folders(self, audio_locations=None, video_locations=None):
+        audio_locations = self.audio_locations if audio_locations is None else audio_locations
+        video_locations = self.video_locations if video_locations is None else video_locations
+        all_folders = set(audio_locations.keys()).union(set(video_locations.keys()))
+
+        for folder_name in all_folders:
+            os.makedirs(os.path.join(self.data_folder, folder_name), exist_ok=True)
+
+    def _categorise_locations(self, folder_locations=None):
         audio_locations = {}
         video_locations = {}
 
-        for folder_name, download_settings in self.folder_locations.items():
+        for folder_name, download_settings in (folder_locations or self.folder_locations).items():
             has_video = "video_ext" in download_settings
             has_audio = "audio_ext" in download_settings
 
@@ -0,0 +1,73 @@
+const searchQuery = document.getElementById('search-query');
+const searchButton = document.getElementById('search-button');
+const searchResults = document.getElementById('search-results');
+const searchTemplate = document.getElementById('search-result-template');
+
+function formatTimestamp(ms) {
+    const totalSeconds = Math.floor(ms / 1000);
+    const hours = Math.floor(totalSeconds / 3600);
+    const minutes = Math.floor((totalSeconds % 3600) / 60);
+    const seconds = String(totalSeconds % 60).padStart(2, '0');
+    return hours ? `${hours}:${String(minutes).padStart(2, '0')}:${seconds}` : `${minutes}:${seconds}`;
+}
+
+function renderSnippet(element, snippet) {
+    element.replaceChildren();
+    snippet.split('\x02').forEach((part, index) => {
+        const [highlighted, rest] = index === 0 ? ['', part] : part.split('\x03');
+        if (highlighted) {
+            const mark = document.createElement('mark');
+            mark.textContent = highlighted;
+            element.appendChild(mark);
+        }
+        if (rest) {
+            element.appendChild(document.createTextNode(rest));
+        }
+    });
+}
+
+function renderSearchResults(hits) {
+    searchResults.replaceChildren();
+    if (!hits.length) {
+        const empty = document.createElement('li');
+        empty.className = 'list-group-item text-body-secondary';
+        empty.textContent = 'No matches.';
+        searchResults.appendChild(empty);
+        return;
+    }
+    hits.forEach(hit => {
+        const row = document.importNode(searchTemplate.content, true);
+        const title = row.querySelector('.search-title');
+        title.textContent = hit.title;
+        if (hit.link) {
+            title.href = hit.link;
+        } else {
+            title.removeAttribute('href');
+        }
+        row.querySelector('.search-timestamp').textContent = formatTimestamp(hit.start_ms);
+        row.querySelector('.search-folder').textContent = hit.folder || '';
+        renderSnippet(row.querySelector('.search-snippet'), hit.snippet || '');
+        searchResults.appendChild(row);
+    });
+}
+
+function runSearch() {
+    const query = searchQuery.value.trim();
+    if (!query) {
+        searchResults.replaceChildren();
+        return;
+    }
+    fetch(`/api/search?q=${encodeURIComponent(query)}`)
+        .then(response => response.json())
+        .then(data => renderSearchResults(data.hits || []))
+        .catch(error => console.error('Search failed:', error));
+}
+
+searchButton.addEventListener('click', runSearch);
+
+searchQuery.addEventListener('keydown', function (event) {
+    if (event.key === 'Enter') {
+        event.preventDefault();
+        runSearch();
+    }
+});
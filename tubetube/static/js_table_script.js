@@ -3,7 +3,9 @@ const template = document.getElementById('row-template');
 const selectAll = document.getElementById('select-all');
 const removeSelected = document.getElementById('remove-selected');
 const removeCompleted = document.getElementById('remove-completed');
+const moveToFront = document.getElementById('move-to-front');
 let lastChecked = null;
+let listVersion = null;
 
 function updateSelectAllState() {
     const allCheckboxes = document.querySelectorAll('.row-select');
@@ -14,6 +16,10 @@ function updateSelectAllState() {
     selectAll.indeterminate = !allChecked && anyChecked;
 }
 
+function progressText(item) {
+    return item.transcript ? `${item.progress} (transcript: ${item.transcript})` : item.progress;
+}
+
 function renderRow(data) {
     const row = document.importNode(template.content, true);
     const tr = row.querySelector('tr');
@@ -30,31 +36,45 @@ function renderRow(data) {
     tr.querySelector('.id').textContent = data.id;
     tr.querySelector('.title').textContent = data.title;
     tr.querySelector('.status').textContent = data.status;
-    tr.querySelector('.download-progress').textContent = data.progress;
+    tr.querySelector('.download-progress').textContent = progressText(data);
     tableBody.appendChild(tr);
 }
 
-socket.on('update_download_list', (items) => {
-    tableBody.innerHTML = '';
-    for (const id in items) {
-        renderRow(items[id]);
-    }
-});
-
-socket.on('update_download_item', (update) => {
-    const item = update.item;
+function updateRow(item) {
     const row = document.querySelector(`tr[data-id='${item.id}']`);
     if (row) {
         row.querySelector('.status').textContent = item.status;
-        row.querySelector('.download-progress').textContent = item.progress;
+        row.querySelector('.download-progress').textContent = progressText(item);
     }
-});
+}
 
-socket.on('remove_download_item', (update) => {
-    const row = document.querySelector(`tr[data-id='${update.id}']`);
+function removeRow(id) {
+    const row = document.querySelector(`tr[data-id='${id}']`);
     if (row) {
         row.remove();
     }
+}
+
+socket.on('update_download_list', (snapshot) => {
+    tableBody.innerHTML = '';
+    snapshot.items.forEach(renderRow);
+    listVersion = snapshot.version;
+});
+
+socket.on('download_list_delta', (delta) => {
+    if (listVersion === null || delta.version <= listVersion) {
+        return;
+    }
+    if (delta.base_version !== listVersion) {
+        listVersion = null;
+        socket.emit('request_snapshot');
+        return;
+    }
+
+    delta.removed.forEach(removeRow);
+    delta.added.forEach(renderRow);
+    delta.updated.forEach(updateRow);
+    listVersion = delta.version;
 
     const rowCount = document.querySelectorAll('#activity-table-body tr').length;
     if (rowCount === 0) {
@@ -62,6 +82,15 @@ socket.on('remove_download_item', (update) => {
     }
 });
 
+socket.on('download_progress', (update) => {
+    for (const id in update.items) {
+        const row = document.querySelector(`tr[data-id='${id}']`);
+        if (row) {
+            row.querySelector('.download-progress').textContent = update.items[id].progress;
+        }
+    }
+});
+
 selectAll.addEventListener('change', function () {
     const isChecked = this.checked;
     document.querySelectorAll('.row-select').forEach(checkbox => {
@@ -78,7 +107,7 @@ removeSelected.addEventListener('click', function () {
         const id = parseInt(row.getAttribute('data-id'), 10);
         const status = row.querySelector('.status').textContent.trim();
 
-        if (status === 'In Progress' || status === 'Downloading' || status === 'Pending') {
+        if (status === 'In Progress' || status === 'Downloading' || status === 'Pending' || status === 'Queued for Processing') {
             cancelIds.push(id);
         } else {
             removeIds.push(id);
@@ -110,6 +139,22 @@ removeCompleted.addEventListener('click', function () {
     }
 });
 
+moveToFront.addEventListener('click', function () {
+    const pendingIds = [];
+
+    document.querySelectorAll('.row-select:checked').forEach(checkbox => {
+        const row = checkbox.closest('tr');
+        const status = row.querySelector('.status').textContent.trim();
+        if (status === 'Pending') {
+            pendingIds.push(parseInt(row.getAttribute('data-id'), 10));
+        }
+    });
+
+    if (pendingIds.length > 0) {
+        socket.emit('move_to_front', pendingIds);
+    }
+});
+
 tableBody.addEventListener('click', function (event) {
     if (event.target.classList.contains('row-select')) {
         const currentCheckbox = event.target;
@@ -0,0 +1,174 @@
+import os
+import time
+import logging
+import cProfile
+import threading
+from collections import OrderedDict
+from yt_dlp.postprocessor.ffmpeg import FFmpegPostProcessor
+
+
+_context = threading.local()
+_ffmpeg_timing_installed = False
+
+
+def install_ffmpeg_timing():
+    global _ffmpeg_timing_installed
+    if _ffmpeg_timing_installed:
+        return
+    run_ffmpeg = FFmpegPostProcessor.real_run_ffmpeg
+
+    def timed_run_ffmpeg(self, *args, **kwargs):
+        started = time.monotonic()
+        try:
+            return run_ffmpeg(self, *args, **kwargs)
+        finally:
+            listener = getattr(_context, "ffmpeg_listener", None)
+            if listener:
+                listener(self.pp_key(), time.monotonic() - started)
+
+    FFmpegPostProcessor.real_run_ffmpeg = timed_run_ffmpeg
+    _ffmpeg_timing_installed = True
+
+
+def set_ffmpeg_listener(listener):
+    _context.ffmpeg_listener = listener
+
+
+class ItemTrace:
+    def __init__(self, max_events=200):
+        self.max_events = max_events
+        self.events = []
+        self.lock = threading.Lock()
+        self.transfer_file = None
+        self.transfer_bytes = 0
+
+    def begin(self, name, **fields):
+        with self.lock:
+            if len(self.events) >= self.max_events:
+                return
+            self.events.append({"name": name, "start": time.time(), "end": None, "seconds": None, **fields})
+
+    def end(self, name, **fields):
+        with self.lock:
+            for event in reversed(self.events):
+                if event["name"] == name and event["end"] is None:
+                    event["end"] = time.time()
+                    event["seconds"] = round(event["end"] - event["start"], 4)
+                    event.update(fields)
+                    return event["seconds"]
+        return None
+
+    def is_open(self, name):
+        with self.lock:
+            return any(event["name"] == name and event["end"] is None for event in self.events)
+
+    def record(self, name, seconds, **fields):
+        with self.lock:
+            if len(self.events) >= self.max_events:
+                return
+            self.events.append({"name": name, "start": None, "end": time.time(), "seconds": round(seconds, 4), **fields})
+
+    def observe_transfer(self, d):
+        if d["status"] == "downloading":
+            filename = d.get("filename")
+            if filename != self.transfer_file:
+                self.end("transfer", bytes=self.transfer_bytes)
+                self.end("prepare")
+                self.transfer_file = filename
+                self.begin("transfer", file=os.path.basename(filename or ""))
+            self.transfer_bytes = d.get("downloaded_bytes") or 0
+        elif d["status"] == "finished":
+            self.end("transfer", bytes=d.get("total_bytes") or d.get("downloaded_bytes") or self.transfer_bytes)
+            self.transfer_file = None
+
+    def summary(self):
+        totals = {}
+        with self.lock:
+            for event in self.events:
+                if event["seconds"] is None:
+                    continue
+                name = event["name"]
+                if event.get("postprocessor"):
+                    name = f'{name}:{event["postprocessor"]}'
+                totals[name] = round(totals.get(name, 0) + event["seconds"], 3)
+        return totals
+
+    def to_dict(self):
+        with self.lock:
+            events = [dict(event) for event in self.events]
+        return {"events": events, "summary": self.summary()}
+
+
+class Tracer:
+    def __init__(self, max_traces=500, profile_dir=None):
+        self.max_traces = max_traces
+        self.profile_dir = profile_dir
+        self.lock = threading.Lock()
+        self.traces = OrderedDict()
+        self.profile_ids = set()
+
+    def start(self, download_id):
+        trace = ItemTrace()
+        with self.lock:
+            self.traces[download_id] = trace
+            self.traces.move_to_end(download_id)
+            while len(self.traces) > self.max_traces:
+                self.traces.popitem(last=False)
+        return trace
+
+    def get(self, download_id):
+        return self.traces.get(download_id)
+
+    def discard(self, download_ids):
+        with self.lock:
+            for download_id in download_ids:
+                self.traces.pop(download_id, None)
+                self.profile_ids.discard(download_id)
+
+    def set_profiling(self, download_id, enabled):
+        with self.lock:
+            if enabled:
+                self.profile_ids.add(download_id)
+            else:
+                self.profile_ids.discard(download_id)
+        logging.info(f"Profiling for item {download_id}: {enabled}")
+
+    def profile_path(self, download_id, stage):
+        if download_id not in self.profile_ids or not self.profile_dir:
+            return None
+        os.makedirs(self.profile_dir, exist_ok=True)
+        return os.path.join(self.profile_dir, f"item-{download_id}-{stage}-{time.strftime('%Y%m%d-%H%M%S')}.prof")
+
+    def profile_files(self):
+        if not self.profile_dir or not os.path.isdir(self.profile_dir):
+            return []
+        return sorted(os.listdir(self.profile_dir))
+
+
+class ProfileSession:
+    def __init__(self, path):
+        self.path = path
+        self.profile = None
+
+    def __enter__(self):
+        if not self.path:
+            return self
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as e:
+            logging.warning(f"Unable to start profiler for {self.path}: {e}")
+            return self
+        self.profile = profile
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if not self.profile:
+            return False
+        self.profile.disable()
+        try:
+            self.profile.dump_stats(self.path)
+            logging.info(f"Profile written to {self.path}")
+        except OSError as e:
+            logging.error(f"Unable to write profile {self.path}: {e}")
+        return False
@@ -0,0 +1,167 @@
+import os
+import re
+import sys
+import logging
+import argparse
+from vtt_tool import VttSubtitleTool
+
+
+CONVERT_CHUNK_SIZE = 4096
+
+_converters = {}
+
+
+def get_converter(conversion):
+    converter = _converters.get(conversion)
+    if converter is None:
+        from opencc import OpenCC
+
+        converter = _converters[conversion] = OpenCC(conversion)
+    return converter
+
+
+class ParagraphSegmenter:
+    _WHITESPACE_RE = re.compile(r"\s+")
+    _BREAK_RE = re.compile(r"([。！？!?；;])|([，,、:：])|( )")
+
+    def __init__(self, min_len=80, max_len=120):
+        self.min_len = min_len
+        self.max_len = max_len
+        self.text = ""
+        self.pending_space = False
+
+    def feed(self, chunk):
+        text = self._WHITESPACE_RE.sub(" ", chunk)
+        if self.pending_space and not text.startswith(" "):
+            text = " " + text
+        self.pending_space = text.endswith(" ")
+        if self.pending_space:
+            text = text[:-1]
+        if not self.text:
+            text = text.lstrip(" ")
+        self.text += text
+
+        paragraphs = []
+        start = 0
+        while len(self.text) - start > self.max_len:
+            start, paragraph = self._split(start)
+            if paragraph:
+                paragraphs.append(paragraph)
+        self.text = self.text[start:]
+        return paragraphs
+
+    def _split(self, start):
+        # More than max_len characters remain: break after the last sentence ender between min_len and max_len,
+        # else the last soft ender, else the last space, else hard at min_len.
+        breaks = [0, 0, 0, 0]
+        for match in self._BREAK_RE.finditer(self.text, start + max(self.min_len - 1, 0), start + self.max_len):
+            breaks[match.lastindex] = match.end()
+        end = breaks[1] or breaks[2] or breaks[3] or start + self.min_len
+        paragraph = self.text[start:end].strip()
+        if self.text.startswith(" ", end):
+            end += 1
+        return end, paragraph
+
+    def close(self):
+        paragraph = self.text.strip()
+        self.text = ""
+        self.pending_space = False
+        return [paragraph] if paragraph else []
+
+
+class TranscriptPipeline:
+    def __init__(self, conversion=None, min_len=80, max_len=120, merge_rolling=True):
+        self.converter = get_converter(conversion) if conversion else None
+        self.min_len = min_len
+        self.max_len = max_len
+        self.merge_rolling = merge_rolling
+        self.tool = VttSubtitleTool()
+
+    def iter_text_chunks(self, file_path):
+        cues = self.tool.iter_cues_from_file(file_path)
+        if self.merge_rolling:
+            cues = self.tool.merge_cues(cues)
+        parts = []
+        size = 0
+        for cue in cues:
+            if not cue.text:
+                continue
+            parts.append(cue.text)
+            size += len(cue.text) + 1
+            if size >= CONVERT_CHUNK_SIZE:
+                yield self._convert(" ".join(parts)) + " "
+                parts = []
+                size = 0
+        if parts:
+            yield self._convert(" ".join(parts))
+
+    def _convert(self, text):
+        return self.converter.convert(text) if self.converter else text
+
+    def iter_paragraphs(self, file_path):
+        segmenter = ParagraphSegmenter(self.min_len, self.max_len)
+        for chunk in self.iter_text_chunks(file_path):
+            yield from segmenter.feed(chunk)
+        yield from segmenter.close()
+
+    def transcribe_file(self, file_path):
+        return "\n\n".join(self.iter_paragraphs(file_path))
+
+    def write_transcript(self, file_path, output_path, heading=None):
+        temp_path = f"{output_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            if heading:
+                file.write(f"# {heading}\n\n")
+            first = True
+            for paragraph in self.iter_paragraphs(file_path):
+                if not first:
+                    file.write("\n\n")
+                file.write(paragraph)
+                first = False
+        os.replace(temp_path, output_path)
+
+
+def transcript_path_for(path, extension="txt"):
+    return f"{os.path.splitext(path)[0]}.{extension}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Turn .vtt subtitle files into paragraph-formatted transcripts.")
+    parser.add_argument("paths", nargs="+", help=".vtt files, or folders to search recursively")
+    parser.add_argument("--convert", default="t2s", help="OpenCC conversion to apply, empty to disable (default: t2s)")
+    parser.add_argument("--min-len", type=int, default=80, help="minimum paragraph length in characters")
+    parser.add_argument("--max-len", type=int, default=120, help="maximum paragraph length in characters")
+    parser.add_argument("--stdout", action="store_true", help="print transcripts instead of writing .txt files next to the sources")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    try:
+        pipeline = TranscriptPipeline(args.convert or None, args.min_len, args.max_len)
+    except ImportError:
+        logging.error("Missing dependency: opencc. Install opencc-python-reimplemented to enable conversion.")
+        return 1
+
+    status = 0
+    for path in args.paths:
+        files = pipeline.tool.list_vtt_files(path, recursive=True) if os.path.isdir(path) else [path]
+        for file_path in files:
+            if not os.path.isfile(file_path):
+                logging.error(f"VTT file not found: {file_path}")
+                status = 1
+                continue
+            if args.stdout:
+                print(pipeline.transcribe_file(file_path))
+                continue
+            output_path = transcript_path_for(file_path)
+            try:
+                pipeline.write_transcript(file_path, output_path)
+            except OSError as e:
+                logging.error(f"Unable to write transcript {output_path}: {e}")
+                status = 1
+                continue
+            logging.info(f"Wrote {output_path}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
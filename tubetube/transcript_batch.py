@@ -0,0 +1,146 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import logging
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from vtt_tool import VttSubtitleTool
+from transcript import TranscriptPipeline, transcript_path_for
+
+
+MANIFEST_NAME = ".transcripts.json"
+MANIFEST_FORMAT = "paragraphs"
+MANIFEST_SAVE_INTERVAL = 500
+HASH_CHUNK_SIZE = 1024 * 1024
+
+_pipeline = None
+
+
+def _init_worker(conversion):
+    global _pipeline
+    _pipeline = TranscriptPipeline(conversion)
+
+
+def _hash_file(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _process_file(path, transcript_path, known_hash):
+    digest = _hash_file(path)
+    if digest == known_hash and os.path.isfile(transcript_path):
+        return digest, False
+
+    _pipeline.write_transcript(path, transcript_path)
+    return digest, True
+
+
+class TranscriptBatch:
+    def __init__(self, root, manifest_path=None, workers=None, conversion=None):
+        self.root = os.path.abspath(root)
+        self.manifest_path = manifest_path or os.path.join(self.root, MANIFEST_NAME)
+        self.workers = workers or os.cpu_count() or 1
+        self.conversion = conversion
+        self.tool = VttSubtitleTool()
+        self.entries = self._load_manifest()
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as file:
+                manifest = json.load(file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable transcript manifest {self.manifest_path}: {e}")
+            return {}
+        if manifest.get("conversion") != self.conversion or manifest.get("format") != MANIFEST_FORMAT:
+            logging.info("Transcript settings changed, rebuilding all transcripts.")
+            return {}
+        return manifest.get("files", {})
+
+    def _save_manifest(self):
+        temp_path = f"{self.manifest_path}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump({"format": MANIFEST_FORMAT, "conversion": self.conversion, "files": self.entries}, file, ensure_ascii=False)
+            os.replace(temp_path, self.manifest_path)
+        except OSError as e:
+            logging.error(f"Unable to write transcript manifest: {e}")
+
+    def _pending_files(self, stats):
+        seen = set()
+        for path in self.tool.list_vtt_files(self.root, recursive=True):
+            key = os.path.relpath(path, self.root)
+            seen.add(key)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            stats["scanned"] += 1
+            entry = self.entries.get(key)
+            transcript_path = transcript_path_for(path)
+            if entry and entry["mtime"] == stat.st_mtime_ns and entry["size"] == stat.st_size and os.path.isfile(transcript_path):
+                stats["skipped"] += 1
+                continue
+            yield key, path, transcript_path, stat, entry.get("sha1") if entry else None
+
+        for key in [key for key in self.entries if key not in seen]:
+            del self.entries[key]
+            stats["removed"] += 1
+
+    def run(self):
+        started = time.monotonic()
+        stats = {"scanned": 0, "skipped": 0, "unchanged": 0, "written": 0, "failed": 0, "removed": 0}
+        pending = list(self._pending_files(stats))
+        logging.info(f"Transcripts: {stats['scanned']} subtitle files under {self.root}, {len(pending)} to check.")
+
+        if pending:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(self.conversion,)) as executor:
+                futures = {executor.submit(_process_file, path, transcript_path, known_hash): (key, path, stat) for key, path, transcript_path, stat, known_hash in pending}
+                for done, future in enumerate(as_completed(futures), 1):
+                    key, path, stat = futures[future]
+                    try:
+                        digest, written = future.result()
+                    except Exception as e:
+                        logging.error(f"Transcript extraction failed for {path}: {e}")
+                        stats["failed"] += 1
+                        continue
+                    stats["written" if written else "unchanged"] += 1
+                    self.entries[key] = {"mtime": stat.st_mtime_ns, "size": stat.st_size, "sha1": digest}
+                    if done % MANIFEST_SAVE_INTERVAL == 0:
+                        self._save_manifest()
+
+        if pending or stats["removed"]:
+            self._save_manifest()
+        stats["seconds"] = round(time.monotonic() - started, 3)
+        logging.info(f"Transcripts finished: {stats}")
+        return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a paragraph-formatted .txt transcript next to every .vtt file under a folder.")
+    parser.add_argument("root", nargs="?", default="/data", help="folder to scan recursively")
+    parser.add_argument("--manifest", help=f"manifest file, defaults to {MANIFEST_NAME} in the root folder")
+    parser.add_argument("--workers", type=int, default=0, help="worker processes, defaults to the CPU count")
+    parser.add_argument("--convert", default="", help="OpenCC conversion to apply, e.g. t2s")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    if args.convert:
+        try:
+            import opencc  # noqa: F401
+        except ImportError:
+            logging.error("Missing dependency: opencc. Install opencc-python-reimplemented to enable conversion.")
+            return 1
+
+    stats = TranscriptBatch(args.root, args.manifest, args.workers, args.convert or None).run()
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
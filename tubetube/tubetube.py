@@ -1,9 +1,20 @@
+import time
+
+IMPORT_STARTED = time.monotonic()
+
+import os
+import atexit
 import logging
 import threading
-from flask import Flask, render_template
+from flask import Flask, Response, render_template, request, jsonify
 from flask_socketio import SocketIO
 from settings import Settings, Config
 from yt_downloader import DownloadManager
+import helpers
+
+IMPORT_SECONDS = time.monotonic() - IMPORT_STARTED
+EXTRACTOR_READY_TIMEOUT = 120
+ALWAYS_AVAILABLE_PATHS = {"/", "/healthz", "/readyz"}
 
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -11,38 +22,163 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(
 
 class WebApp(Settings, DownloadManager):
     def __init__(self):
-        Settings.__init__(self)
-        DownloadManager.__init__(self)
         self.app = Flask(__name__)
         self.app.secret_key = Config.SECRET_KEY
         self.socketio = SocketIO(self.app, cors_allowed_origins=Config.SOCKETIO_CORS_ALLOWED_ORIGINS)
+        self.ready_event = threading.Event()
+        self.startup = {"phase": "starting", "import_seconds": round(IMPORT_SECONDS, 3)}
+        self.startup_started = time.monotonic()
+
+        @self.app.before_request
+        def check_ready():
+            if request.path in ALWAYS_AVAILABLE_PATHS or request.path.startswith("/static/"):
+                return None
+            if self.startup["phase"] == "failed":
+                return jsonify({"error": f"TubeTube failed to start: {self.startup.get('error')}", "startup": self.startup}), 503
+            if self.ready_event.is_set():
+                return None
+            return jsonify({"error": "TubeTube is starting", "startup": self.startup}), 503
 
         @self.app.route("/")
         def handle_index():
             return render_template("index.html")
 
+        @self.app.route("/healthz")
+        def handle_healthz():
+            return jsonify({"status": "ok"})
+
+        @self.app.route("/readyz")
+        def handle_readyz():
+            return jsonify(self.startup), 200 if self.startup["phase"] == "ready" else 503
+
+        @self.app.route("/api/workers", methods=["GET", "POST"])
+        def handle_workers():
+            if request.method == "POST":
+                data = request.get_json(silent=True) or {}
+                return jsonify(self.set_thread_count(data.get("count", 0), data.get("adaptive")))
+            return jsonify(self.worker_status())
+
+        @self.app.route("/api/bandwidth", methods=["GET", "POST"])
+        def handle_bandwidth():
+            if request.method == "POST":
+                data = request.get_json(silent=True) or {}
+                return jsonify(self.set_bandwidth_limit(data.get("limit")))
+            return jsonify(self.bandwidth.status())
+
+        @self.app.route("/api/search")
+        def handle_search():
+            try:
+                limit = int(request.args.get("limit", 50))
+            except ValueError:
+                limit = 50
+            return jsonify({"hits": self.search_transcripts(request.args.get("q", ""), limit)})
+
+        @self.app.route("/metrics")
+        def handle_metrics():
+            return Response(self.metrics.render(), mimetype="text/plain; version=0.0.4")
+
+        @self.app.route("/debug/trace/<int:item_id>")
+        def handle_trace(item_id):
+            trace = self.item_trace(item_id)
+            if trace is None:
+                return jsonify({"error": f"Unknown item {item_id}"}), 404
+            return jsonify(trace)
+
+        @self.app.route("/debug/profile", methods=["GET"])
+        @self.app.route("/debug/profile/<int:item_id>", methods=["POST", "DELETE"])
+        def handle_profile(item_id=None):
+            if item_id is not None:
+                self.tracer.set_profiling(item_id, request.method == "POST")
+            return jsonify({"profiling": sorted(self.tracer.profile_ids), "profiles": self.tracer.profile_files()})
+
         @self.socketio.on("connect")
         def handle_connect():
-            threading.Thread(target=self.client_connect, daemon=True).start()
+            self._start_when_ready(self.client_connect, request.sid)
+
+        @self.socketio.on("request_snapshot")
+        def handle_request_snapshot():
+            self._start_when_ready(self.send_download_list, request.sid)
 
         @self.socketio.on("download")
         def handle_download(item_info):
-            threading.Thread(target=self.download_stuff, daemon=True, args=(item_info,)).start()
+            self._start_when_ready(self.download_stuff, item_info)
 
         @self.socketio.on("remove_items")
         def handle_remove_items(item_ids):
-            threading.Thread(target=self.remove_items, args=(item_ids,), daemon=True).start()
+            self._start_when_ready(self.remove_items, item_ids)
 
         @self.socketio.on("cancel_items")
         def handle_cancel_items(item_ids):
-            threading.Thread(target=self.cancel_items, args=(item_ids,), daemon=True).start()
-
-    def client_connect(self):
+            self._start_when_ready(self.cancel_items, item_ids)
+
+        @self.socketio.on("set_thread_count")
+        def handle_set_thread_count(data):
+            self._start_when_ready(self.set_thread_count, data.get("count", 0), data.get("adaptive"))
+
+        @self.socketio.on("set_bandwidth_limit")
+        def handle_set_bandwidth_limit(data):
+            self._start_when_ready(self.set_bandwidth_limit, data.get("limit"))
+
+        @self.socketio.on("move_to_front")
+        def handle_move_to_front(item_ids):
+            self._start_when_ready(self.move_to_front, item_ids)
+
+    def start(self, lazy=True):
+        if lazy:
+            threading.Thread(target=self._warm_up, daemon=True, name="WarmUp").start()
+        else:
+            self._warm_up()
+
+    def _warm_up(self):
+        try:
+            self._startup_phase("settings")
+            helpers.run_blocking(Settings.__init__, self)
+            self._startup_phase("download_manager")
+            DownloadManager.__init__(self)
+            atexit.register(self.shutdown)
+            self._startup_phase("extractors")
+            helpers.run_blocking(helpers.load_extractors)
+            if not self.extraction_pool.ready.wait(EXTRACTOR_READY_TIMEOUT):
+                logging.warning("Extraction workers are still starting, accepting submissions anyway.")
+        except Exception as e:
+            logging.exception("Startup failed")
+            self.startup["phase"] = "failed"
+            self.startup["error"] = str(e)
+            self.ready_event.set()
+            return
+        self._startup_phase("ready")
+        self.startup["ready_seconds"] = round(time.monotonic() - self.startup_started, 3)
+        logging.info(f"TubeTube ready in {self.startup['ready_seconds']}s (imports took {self.startup['import_seconds']}s)")
+        self.ready_event.set()
+
+    def _startup_phase(self, phase):
+        now = time.monotonic()
+        previous = self.startup["phase"]
+        if previous != "starting":
+            self.startup[f"{previous}_seconds"] = round(now - self.phase_started, 3)
+        self.phase_started = now
+        self.startup["phase"] = phase
+
+    def _start_when_ready(self, target, *args):
+        threading.Thread(target=self._run_when_ready, args=(target, args), daemon=True).start()
+
+    def _run_when_ready(self, target, args):
+        if not self.ready_event.is_set():
+            logging.info(f"Holding {target.__name__} until startup finishes.")
+            self.ready_event.wait()
+        if self.startup["phase"] == "ready":
+            target(*args)
+        else:
+            logging.error(f"Dropped {target.__name__} because startup failed: {self.startup.get('error')}")
+            self.socketio.emit("toast", {"title": "TubeTube failed to start", "body": f"The request was not processed.\n\n {self.startup.get('error')}"})
+
+    def client_connect(self, sid):
         self.socketio.emit(
             "update_folder_locations",
             {"audio": self.audio_locations, "video": self.video_locations},
+            to=sid,
         )
-        self.socketio.emit("update_download_list", self.all_items)
+        self.send_download_list(to=sid)
 
     def download_stuff(self, item_info):
         folder_name = item_info.get("folder_name")
@@ -62,6 +198,7 @@ class WebApp(Settings, DownloadManager):
 
 
 web_app = WebApp()
+web_app.start(lazy=os.getenv("LAZY_STARTUP", "true").strip().lower() not in {"0", "false", "no", "off"})
 if __name__ == "__main__":
     web_app.run_app()
 else:
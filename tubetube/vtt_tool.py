@@ -1,15 +1,28 @@
+import io
 import os
 import re
+from collections import namedtuple
+
+
+Cue = namedtuple("Cue", ["start", "end", "text"])
 
 
 class VttSubtitleTool:
-    _BLOCK_SPLIT_RE = re.compile(r"\n\s*\n")
+    _HEADER_PREFIXES = ("WEBVTT", "NOTE", "STYLE", "REGION")
+    _MERGE_WINDOW = 128
+    _MIN_OVERLAP_WORDS = 2
+    _MIN_OVERLAP_CHARS = 4
+    _MIN_REPEATED_CUE_WORDS = 3
+    _UNSPACED_CHAR_RE = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff]")
     _TAG_RE = re.compile(r"<[^>]+>")
+    _WHITESPACE_RE = re.compile(r"\s+")
     _TIMESTAMP_LINE_RE = re.compile(
-        r"^\s*\d{1,2}:\d{2}(?::\d{2})?\.\d{3}\s+-->\s+\d{1,2}:\d{2}(?::\d{2})?\.\d{3}(?:\s+.*)?$"
+        r"^\s*(\d{1,2}):(\d{2})(?::(\d{2}))?\.(\d{3})\s+-->\s+(\d{1,2}):(\d{2})(?::(\d{2}))?\.(\d{3})(?:\s+.*)?$"
     )
 
-    def list_vtt_files(self, directory):
+    def list_vtt_files(self, directory, recursive=False):
+        if recursive:
+            return sorted(self._walk_vtt_files(directory))
         try:
             entries = os.listdir(directory)
         except OSError:
@@ -24,6 +37,13 @@ class VttSubtitleTool:
                 vtt_files.append(path)
         return sorted(vtt_files)
 
+    def _walk_vtt_files(self, directory):
+        for root, dirs, files in os.walk(directory):
+            dirs[:] = [name for name in dirs if not name.startswith(".")]
+            for name in files:
+                if name.lower().endswith(".vtt"):
+                    yield os.path.join(root, name)
+
     def extract_text_from_directory(self, directory):
         texts = []
         for file_path in self.list_vtt_files(directory):
@@ -38,53 +58,128 @@ class VttSubtitleTool:
             results[file_path] = self.extract_text_from_file(file_path)
         return results
 
-    def extract_text_from_file(self, file_path):
-        content = self._read_file(file_path)
-        return self.extract_text_from_vtt(content)
+    def extract_text_from_file(self, file_path, merge_rolling=True):
+        cues = self.iter_cues_from_file(file_path)
+        if merge_rolling:
+            cues = self.merge_cues(cues)
+        return self._join_cues(cues)
 
-    def extract_text_from_vtt(self, content):
+    def extract_text_from_vtt(self, content, merge_rolling=True):
         if not content:
             return ""
+        cues = self.iter_cues(io.StringIO(content, newline=None))
+        if merge_rolling:
+            cues = self.merge_cues(cues)
+        return self._join_cues(cues)
 
-        normalized = content.replace("\r\n", "\n").replace("\r", "\n")
-        blocks = self._BLOCK_SPLIT_RE.split(normalized.strip())
-        texts = []
+    def iter_cues_from_file(self, file_path):
+        try:
+            with open(file_path, "r", encoding="utf-8-sig", errors="replace") as handle:
+                yield from self.iter_cues(handle)
+        except OSError:
+            return
 
-        for block in blocks:
-            block = block.strip()
-            if not block:
-                continue
-            lines = [line.strip() for line in block.split("\n") if line.strip()]
-            if not lines:
+    def iter_cues(self, lines):
+        parse_block = self._parse_block
+        block = []
+        for line in lines:
+            line = line.strip()
+            if line:
+                block.append(line)
+            elif block:
+                cue = parse_block(block)
+                block = []
+                if cue:
+                    yield cue
+        if block:
+            cue = parse_block(block)
+            if cue:
+                yield cue
+
+    def merge_cues(self, cues):
+        # Auto-generated captions roll: each cue repeats the previous line before adding a new one,
+        # and short in-between cues repeat it alone. Drop the words a cue shares with the end of
+        # what has already been emitted.
+        tail = []
+        for cue in cues:
+            words = cue.text.split()
+            if not words:
                 continue
-            first = lines[0]
-            if first.startswith("WEBVTT") or first.startswith("NOTE") or first.startswith("STYLE") or first.startswith("REGION"):
+            overlap = self._overlap(tail[-len(words) :], words)
+            if overlap and not self._is_rolling_overlap(words, overlap):
+                overlap = 0
+            added = words[overlap:]
+            if not added:
                 continue
+            tail.extend(added)
+            del tail[: -self._MERGE_WINDOW]
+            yield cue._replace(text=" ".join(added))
 
-            time_index = None
-            for idx, line in enumerate(lines):
-                if self._TIMESTAMP_LINE_RE.match(line):
-                    time_index = idx
-                    break
-            if time_index is None:
-                continue
+    def _overlap(self, tail, words):
+        # Longest prefix of words that is also a suffix of tail. The earliest occurrence of the first
+        # word is the usual answer; otherwise fall back to a KMP failure function over words + tail.
+        try:
+            start = tail.index(words[0])
+        except ValueError:
+            return 0
+        size = len(tail) - start
+        if tail[start:] == words[:size]:
+            return size
+        sequence = words + [None] + tail
+        failure = [0] * len(sequence)
+        matched = 0
+        for idx in range(1, len(sequence)):
+            item = sequence[idx]
+            while matched and item != sequence[matched]:
+                matched = failure[matched - 1]
+            if item == sequence[matched]:
+                matched += 1
+            failure[idx] = matched
+        return failure[-1]
 
-            for text_line in lines[time_index + 1 :]:
-                cleaned = self._clean_text_line(text_line)
-                if cleaned:
-                    texts.append(cleaned)
+    def _is_rolling_overlap(self, words, overlap):
+        # A single short shared word is more likely a coincidence in hand-written subtitles, and short
+        # cues such as "No." are often repeated on purpose, so only drop a whole cue when it is long.
+        if overlap == len(words):
+            return self._word_length(words) >= self._MIN_REPEATED_CUE_WORDS
+        return overlap >= self._MIN_OVERLAP_WORDS or len(words[0]) >= self._MIN_OVERLAP_CHARS
 
-        return " ".join(texts).strip()
+    def _word_length(self, words):
+        # CJK captions have no spaces, so a whole line is one token; count each of its characters as a word.
+        find_unspaced = self._UNSPACED_CHAR_RE.findall
+        return sum(len(find_unspaced(word)) or 1 for word in words)
 
-    def _read_file(self, file_path):
-        try:
-            with open(file_path, "r", encoding="utf-8-sig", errors="replace") as handle:
-                return handle.read()
-        except OSError:
-            return ""
+    def _parse_block(self, lines):
+        if lines[0].startswith(self._HEADER_PREFIXES):
+            return None
+
+        match_timestamp = self._TIMESTAMP_LINE_RE.match
+        for idx, line in enumerate(lines):
+            match = match_timestamp(line)
+            if not match:
+                continue
+            texts = []
+            for text_line in lines[idx + 1 :]:
+                text = self._clean_text_line(text_line)
+                if text:
+                    texts.append(text)
+            groups = match.groups()
+            return Cue(self._timestamp_to_ms(*groups[:4]), self._timestamp_to_ms(*groups[4:]), " ".join(texts))
+        return None
+
+    def _join_cues(self, cues):
+        return " ".join([cue.text for cue in cues if cue.text]).strip()
+
+    def _timestamp_to_ms(self, first, second, third, millis):
+        if third is None:
+            seconds = int(first) * 60 + int(second)
+        else:
+            seconds = int(first) * 3600 + int(second) * 60 + int(third)
+        return seconds * 1000 + int(millis)
 
     def _clean_text_line(self, line):
         if not line:
             return ""
-        line = self._TAG_RE.sub("", line)
-        return re.sub(r"\s+", " ", line).strip()
+        if "<" in line:
+            line = self._TAG_RE.sub("", line)
+        return self._WHITESPACE_RE.sub(" ", line).strip()
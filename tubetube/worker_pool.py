@@ -0,0 +1,128 @@
+import os
+import time
+import logging
+import itertools
+import threading
+
+
+class WorkerPool:
+    def __init__(self, run_once, size, name="Worker"):
+        self.run_once = run_once
+        self.name = name
+        self.lock = threading.Lock()
+        self.size = 0
+        self.workers = set()
+        self.worker_numbers = itertools.count()
+        self.resize(size)
+
+    def resize(self, size):
+        size = max(int(size), 0)
+        with self.lock:
+            previous_size = self.size
+            self.size = size
+            while len(self.workers) < size:
+                worker_name = f"{self.name}-{next(self.worker_numbers)}"
+                self.workers.add(worker_name)
+                worker = threading.Thread(target=self._run, daemon=True, name=worker_name)
+                worker.start()
+                logging.info(f"Started thread: {worker_name}")
+        if previous_size != size:
+            logging.info(f"{self.name} pool resized from {previous_size} to {size}.")
+        return size
+
+    def _run(self):
+        worker_name = threading.current_thread().name
+        while True:
+            with self.lock:
+                if len(self.workers) > self.size:
+                    self.workers.discard(worker_name)
+                    logging.info(f"Stopped idle thread: {worker_name}")
+                    return
+            try:
+                self.run_once()
+            except Exception as e:
+                logging.error(f"Unhandled error in {worker_name}: {e}")
+
+    def worker_count(self):
+        with self.lock:
+            return len(self.workers)
+
+    def stop(self, timeout=5):
+        # Workers leave after their current job, so wait a little for downloads in progress to finish.
+        self.resize(0)
+        deadline = time.monotonic() + timeout
+        while self.worker_count() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        return self.worker_count() == 0
+
+
+class AdaptiveConcurrency:
+    def __init__(self, pool, min_size, max_size, interval, cpu_limit, throughput_fn, backlog_fn):
+        self.pool = pool
+        self.min_size = max(min_size, 1)
+        self.max_size = max(max_size, self.min_size)
+        self.interval = interval
+        self.cpu_limit = cpu_limit
+        self.throughput_fn = throughput_fn
+        self.backlog_fn = backlog_fn
+        self.enabled = True
+        self.throttle_errors = 0
+        self.last_throttle_errors = 0
+        self.last_throughput = 0.0
+        self.last_action = None
+        self.grow_cooldown = 0
+
+        controller = threading.Thread(target=self._run, daemon=True, name="AdaptiveConcurrency")
+        controller.start()
+        logging.info(f"Adaptive concurrency between {self.min_size} and {self.max_size} threads, checked every {interval}s.")
+
+    def record_throttle(self):
+        self.throttle_errors += 1
+
+    def _cpu_load(self):
+        try:
+            return os.getloadavg()[0] / (os.cpu_count() or 1)
+        except (AttributeError, OSError):
+            return 0.0
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            if not self.enabled:
+                continue
+            try:
+                self.adjust()
+            except Exception as e:
+                logging.error(f"Adaptive concurrency error: {e}")
+
+    def adjust(self):
+        size = self.pool.size
+        throughput = self.throughput_fn()
+        cpu_load = self._cpu_load()
+        throttles = self.throttle_errors - self.last_throttle_errors
+        self.last_throttle_errors = self.throttle_errors
+        self.grow_cooldown = max(self.grow_cooldown - 1, 0)
+
+        if throttles:
+            new_size, reason = max(self.min_size, size // 2), f"{throttles} throttled requests"
+        elif cpu_load > self.cpu_limit:
+            new_size, reason = max(self.min_size, size - 1), f"CPU load {cpu_load:.2f}"
+        elif self.last_action == "grow" and throughput < self.last_throughput * 1.05:
+            new_size, reason = max(self.min_size, size - 1), "no throughput gain from the last increase"
+            self.grow_cooldown = 5
+        elif not self.grow_cooldown and self.backlog_fn() > 0 and throughput >= self.last_throughput * 0.9:
+            new_size, reason = min(self.max_size, size + 1), "queued work with stable throughput"
+        else:
+            new_size, reason = size, None
+
+        if new_size > size:
+            self.last_action = "grow"
+        elif new_size < size:
+            self.last_action = "shrink"
+        else:
+            self.last_action = None
+        self.last_throughput = throughput
+
+        if new_size != size:
+            logging.info(f"Adaptive concurrency: {size} -> {new_size} threads ({reason}, {throughput / 1024 / 1024:.2f} MiB/s).")
+            self.pool.resize(new_size)
@@ -1,14 +1,33 @@
 import re
 import os
+import time
 import queue
 import logging
 import platform
 import threading
-import random
 import shutil
+import uuid
+import itertools
 import yaml
 import yt_dlp
 from settings import DownloadCancelledException
+from job_store import JobStore
+from broadcaster import Broadcaster
+from progress import ProgressTicker
+from extraction import ExtractionPool
+from metadata_cache import MetadataCache
+from scheduler import DownloadScheduler
+from worker_pool import WorkerPool, AdaptiveConcurrency
+from postprocessing import DeferredPostProcessingYDL, PostProcessingPool
+from bandwidth import BandwidthGovernor, parse_rate, parse_schedule
+from process_worker import DownloadProcess, WorkerProcessError
+from resume import ResumeManifest
+from metrics import MetricsRegistry
+from tracing import Tracer, ProfileSession, install_ffmpeg_timing, set_ffmpeg_listener
+from search_index import SearchIndex
+from archive import DownloadArchive
+from transcript import TranscriptPipeline, transcript_path_for
+from config_watcher import ConfigWatcher
 import helpers
 
 
@@ -27,16 +46,156 @@ DEFAULT_APP_CONFIG = {
     "SUBTITLE_FORMAT": "vtt",
     "SUBTITLE_LANGUAGES": "zh-Hant",
     "THREAD_COUNT": 4,
+    "BROADCAST_INTERVAL": 0.25,
+    "BROADCAST_BATCH_SIZE": 500,
+    "PROGRESS_INTERVAL": 0.5,
+    "EXTRACTION_WORKERS": 4,
+    "EXTRACTION_QUEUE_SIZE": 64,
+    "PLAYLIST_STREAMING": True,
+    "PLAYLIST_CHUNK_SIZE": 50,
+    "METADATA_CACHE": True,
+    "METADATA_CACHE_VIDEO_TTL": 3600,
+    "METADATA_CACHE_PLAYLIST_TTL": 300,
+    "METADATA_CACHE_MAX_MB": 256,
+    "METADATA_CACHE_PLAYLIST_MAX_ENTRIES": 1000,
+    "ADAPTIVE_THREADS": False,
+    "MIN_THREAD_COUNT": 1,
+    "MAX_THREAD_COUNT": 8,
+    "ADAPTIVE_INTERVAL": 30,
+    "ADAPTIVE_CPU_LIMIT": 0.9,
+    "SPLIT_POSTPROCESSING": True,
+    "POSTPROCESS_WORKERS": 2,
+    "POSTPROCESS_QUEUE_SIZE": 8,
+    "BANDWIDTH_LIMIT": "",
+    "BANDWIDTH_SCHEDULE": [],
+    "WORKER_MODE": "thread",
+    "DOWNLOAD_HANG_TIMEOUT": 1800,
+    "TEMP_MAX_AGE_HOURS": 24,
+    "TEMP_MAX_SIZE_MB": 2048,
+    "SEARCH_INDEX": True,
+    "DOWNLOAD_ARCHIVE": True,
+    "TRANSCRIPTS": False,
+    "TRANSCRIPT_FORMAT": "txt",
+    "TRANSCRIPT_CONVERSION": "t2s",
+    "TRANSCRIPT_WORKERS": 1,
+    "TRANSCRIPT_QUEUE_SIZE": 32,
+    "CONFIG_WATCH_INTERVAL": 2,
 }
 
+# Settings applied to new downloads when app_config.yaml changes, everything else needs a restart.
+RELOADABLE_APP_CONFIG = {
+    "VERBOSE_LOGS",
+    "TRIM_METADATA",
+    "PROXY",
+    "JS_RUNTIMES",
+    "PREFERRED_LANGUAGE",
+    "PREFERRED_AUDIO_CODEC",
+    "PREFERRED_VIDEO_CODEC",
+    "PREFERRED_VIDEO_EXT",
+    "EMBED_SUBS",
+    "WRITE_SUBS",
+    "ALLOW_AUTO_SUBS",
+    "SUBTITLE_FORMAT",
+    "SUBTITLE_LANGUAGES",
+    "THREAD_COUNT",
+    "PLAYLIST_STREAMING",
+    "PLAYLIST_CHUNK_SIZE",
+    "BANDWIDTH_LIMIT",
+    "BANDWIDTH_SCHEDULE",
+}
+
+ACTIVE_STATUSES = {"In Progress", "Downloading", "Processing", "Queued for Processing", "Post-processing"}
+
 
 class DownloadManager:
     def __init__(self):
-        self.download_queue = queue.Queue()
+        self.download_queue = DownloadScheduler(self._folder_concurrency_limits())
         self.all_items = {}
         self.lock = threading.Lock()
         self.stop_signals = {}
+        self.url_index = {}
+        self.video_id_index = {}
+        self.id_counter = itertools.count()
+        self._setup_metrics()
+
+        # File reads, SQLite and PATH probes run off the hub; the threads below have to be started on it.
+        helpers.run_blocking(self._load_state)
+
+        self.thread_count = self._get_int("THREAD_COUNT", 4)
+        logging.info(f"Thread Count: {self.thread_count}")
 
+        broadcast_interval = self._get_float("BROADCAST_INTERVAL", 0.25)
+        broadcast_batch_size = self._get_int("BROADCAST_BATCH_SIZE", 500)
+        self.broadcaster = Broadcaster(self.socketio, broadcast_interval, broadcast_batch_size)
+        self.progress_ticker = ProgressTicker(self.socketio, self._get_float("PROGRESS_INTERVAL", 0.5))
+
+        try:
+            bandwidth_limit = parse_rate(self._get_config_value("BANDWIDTH_LIMIT", ""))
+        except ValueError as e:
+            logging.warning(f"{e}, downloads will not be rate limited.")
+            bandwidth_limit = 0
+        self.bandwidth = BandwidthGovernor(bandwidth_limit, parse_schedule(self._get_config_value("BANDWIDTH_SCHEDULE", [])))
+
+        self.worker_mode = self._get_str("WORKER_MODE", "thread").strip().lower()
+        if self.worker_mode not in {"thread", "process"}:
+            logging.warning(f"Unknown WORKER_MODE {self.worker_mode}, using thread.")
+            self.worker_mode = "thread"
+        self.download_hang_timeout = self._get_int("DOWNLOAD_HANG_TIMEOUT", 1800)
+        logging.info(f"Worker Mode: {self.worker_mode}")
+
+        self.split_postprocessing = self._get_bool("SPLIT_POSTPROCESSING", True) and self.worker_mode == "thread"
+        logging.info(f"Split Post-processing: {self.split_postprocessing}")
+        if self.split_postprocessing:
+            self.postprocess_pool = PostProcessingPool(self._get_int("POSTPROCESS_WORKERS", 2), self._get_int("POSTPROCESS_QUEUE_SIZE", 8))
+
+        self.transcript_pool = None
+        if self._get_bool("TRANSCRIPTS", False):
+            self._setup_transcripts()
+
+        self.worker_pool = WorkerPool(self._process_queue, self.thread_count)
+        self.adaptive_concurrency = None
+        if self._get_bool("ADAPTIVE_THREADS", False):
+            self.adaptive_concurrency = AdaptiveConcurrency(
+                self.worker_pool,
+                self._get_int("MIN_THREAD_COUNT", 1),
+                self._get_int("MAX_THREAD_COUNT", 8),
+                self._get_float("ADAPTIVE_INTERVAL", 30),
+                self._get_float("ADAPTIVE_CPU_LIMIT", 0.9),
+                self.progress_ticker.total_speed,
+                self.download_queue.qsize,
+            )
+
+        self.tracer = Tracer(profile_dir=os.path.join(self.temp_folder, "profiles"))
+        install_ffmpeg_timing()
+
+        extraction_workers = self._get_int("EXTRACTION_WORKERS", 4)
+        extraction_queue_size = self._get_int("EXTRACTION_QUEUE_SIZE", 64)
+        logging.info(f"Extraction Workers: {extraction_workers}")
+        self.extraction_pool = ExtractionPool(self._create_parsing_ydl, extraction_workers, extraction_queue_size)
+
+        self.playlist_streaming = self._get_bool("PLAYLIST_STREAMING", True)
+        self.playlist_chunk_size = max(self._get_int("PLAYLIST_CHUNK_SIZE", 50), 1)
+        logging.info(f"Playlist Streaming: {self.playlist_streaming} (chunks of {self.playlist_chunk_size})")
+
+        self._restore_jobs()
+
+        if self.download_archive and self.download_archive.needs_seed():
+            self._seed_download_archive()
+
+        self.search_index = None
+        if self._get_bool("SEARCH_INDEX", True):
+            self.search_index = SearchIndex(self._resolve_config_file_path("TUBETUBE_SEARCH_INDEX", "search.db"))
+            self.search_index.enqueue_scan(getattr(self, "data_folder", "/data"))
+
+        self.config_watcher = None
+        config_watch_interval = self._get_float("CONFIG_WATCH_INTERVAL", 2)
+        if config_watch_interval > 0:
+            watched_paths = [self.app_config_path]
+            if hasattr(self, "reload_settings"):
+                watched_paths.append(self.settings_file_path)
+            self.config_watcher = ConfigWatcher(watched_paths, self._on_config_change, config_watch_interval)
+
+    def _load_state(self):
         os_system = platform.system()
         logging.info(f"OS: {os_system}")
 
@@ -46,109 +205,208 @@ class DownloadManager:
         self.app_config_path = self._resolve_app_config_path()
         self.app_config = self._load_app_config(self.app_config_path)
 
-        self.verbose_ytdlp = self._get_bool("VERBOSE_LOGS", False)
-        logging.info(f"Verbose logging for yt-dlp set to: {self.verbose_ytdlp}")
-
-        self.trim_metadata = self._get_bool("TRIM_METADATA", False)
-        logging.info(f"Trim Metadata set to: {self.trim_metadata}")
+        self.download_options = self._read_download_options()
 
-        proxy_value = self._get_str("PROXY", "")
-        self.proxy = proxy_value.strip() if isinstance(proxy_value, str) else ""
-        self.proxy = self.proxy or None
-        if self.proxy:
-            logging.info("Proxy enabled for yt-dlp requests.")
-        else:
-            logging.info("Proxy disabled for yt-dlp requests.")
-
-        self.js_runtimes = self._parse_js_runtimes(self._get_config_value("JS_RUNTIMES", ""))
-        if not self.js_runtimes:
-            self.js_runtimes = self._auto_detect_js_runtimes()
-        if self.js_runtimes:
-            logging.info(f"JS runtimes for yt-dlp: {self.js_runtimes}")
-        else:
-            logging.info("No JS runtime configured for yt-dlp.")
-
-        self.preferred_language = self._get_str("PREFERRED_LANGUAGE", "en")
-        logging.info(f"Preferred Audio Language: {self.preferred_language}")
-
-        self.preferred_audio_codec = self._get_str("PREFERRED_AUDIO_CODEC", "aac")
-        logging.info(f"Preferred Audio Codec: {self.preferred_audio_codec}")
-
-        self.preferred_video_codec = self._get_str("PREFERRED_VIDEO_CODEC", "vp9")
-        logging.info(f"Preferred Video Codec: {self.preferred_video_codec}")
-
-        self.preferred_video_ext = self._get_str("PREFERRED_VIDEO_EXT", "mp4")
-        logging.info(f"Preferred Video Ext: {self.preferred_video_ext}")
+        temp_env = os.getenv("TUBETUBE_TEMP_DIR")
+        self.temp_folder = temp_env if temp_env else os.path.expanduser("~/.tubetube/temp")
+        os.makedirs(self.temp_folder, exist_ok=True)
 
-        self.embed_subs = self._get_bool("EMBED_SUBS", False)
-        logging.info(f"Embed Subtitles: {self.embed_subs}")
+        self.metadata_cache = None
+        if self._get_bool("METADATA_CACHE", True):
+            self.metadata_cache = MetadataCache(
+                os.path.join(self.temp_folder, "metadata_cache"),
+                self._get_int("METADATA_CACHE_MAX_MB", 256) * 1024 * 1024,
+                self._get_int("METADATA_CACHE_VIDEO_TTL", 3600),
+                self._get_int("METADATA_CACHE_PLAYLIST_TTL", 300),
+            )
+        self.metadata_cache_playlist_max_entries = self._get_int("METADATA_CACHE_PLAYLIST_MAX_ENTRIES", 1000)
+
+        self.parsing_opts = self._build_parsing_opts(self.download_options)
+
+        self.temp_max_age = self._get_float("TEMP_MAX_AGE_HOURS", 24) * 3600
+        self.temp_max_bytes = self._get_int("TEMP_MAX_SIZE_MB", 2048) * 1024 * 1024
+        self.resume_manifest = ResumeManifest(os.path.join(self.temp_folder, "resume_manifest.json"))
+        self.cleanup_temp_folder()
 
-        self.write_subs = self._get_bool("WRITE_SUBS", False)
-        logging.info(f"Write Subtitles: {self.write_subs}")
+        self.job_store = JobStore(self._resolve_config_file_path("TUBETUBE_JOB_STORE", "jobs.db"))
 
-        self.allow_auto_subs = self._get_bool("ALLOW_AUTO_SUBS", True)
-        logging.info(f"Automatic Subtitles Enabled: {self.allow_auto_subs}")
+        self.download_archive = None
+        if self._get_bool("DOWNLOAD_ARCHIVE", True):
+            self.download_archive = DownloadArchive(self._resolve_config_file_path("TUBETUBE_ARCHIVE", "archive.txt"))
 
-        self.subtitle_format = self._get_str("SUBTITLE_FORMAT", "vtt")
-        logging.info(f"Subtitle Format: {self.subtitle_format}")
+    def _seed_download_archive(self):
+        with self.lock:
+            completed = [item for item in self.all_items.values() if item.get("status") == "Complete" and item.get("progress") == "Done"]
+        for kind in ("video", "audio"):
+            archive_ids = [self._item_archive_id(item) for item in completed if self._archive_kind(item) == kind]
+            helpers.run_blocking(self.download_archive.add_many, archive_ids, kind)
+        self.download_archive.start_seed(getattr(self, "data_folder", "/data"))
+
+    def _archive_kind(self, item):
+        return "audio" if item.get("audio_only") else "video"
+
+    def _item_archive_id(self, item):
+        if item.get("archive_id"):
+            return item["archive_id"]
+        if item.get("video_identifier") and helpers.parse_video_id(item.get("url")):
+            return f'youtube {item["video_identifier"]}'
+        return helpers.archive_id_for_url(item.get("url"))
+
+    def _setup_transcripts(self):
+        self.transcript_format = self._get_str("TRANSCRIPT_FORMAT", "txt").strip().lower().lstrip(".")
+        if self.transcript_format not in {"txt", "md"}:
+            logging.warning(f"Unknown TRANSCRIPT_FORMAT {self.transcript_format}, using txt.")
+            self.transcript_format = "txt"
+        conversion = self._get_str("TRANSCRIPT_CONVERSION", "t2s").strip() or None
+        try:
+            self.transcript_pipeline = TranscriptPipeline(conversion)
+        except ImportError:
+            logging.error("Missing dependency: opencc. Transcripts will be written without conversion.")
+            self.transcript_pipeline = TranscriptPipeline()
+        self.transcript_pool = PostProcessingPool(self._get_int("TRANSCRIPT_WORKERS", 1), self._get_int("TRANSCRIPT_QUEUE_SIZE", 32), name="Transcriber")
+        logging.info(f"Transcripts: {self.transcript_format} files, conversion {conversion or 'off'}")
+
+    def _setup_metrics(self):
+        self.metrics = MetricsRegistry()
+        self.metrics.instrument_emit(self.socketio)
+        self.phase_seconds = self.metrics.histogram("tubetube_phase_seconds", "Time spent in each phase of a download.", ("phase",))
+        self.postprocessor_seconds = self.metrics.histogram("tubetube_postprocessor_seconds", "Time spent in each yt-dlp post-processor.", ("postprocessor",))
+        self.failure_counter = self.metrics.counter("tubetube_failures_total", "Failed downloads by exception type.", ("error_type",))
+
+        self.metrics.gauge_callback("tubetube_items", "Items in the download list by status.", self._count_items_by_status, ("status",))
+        self.metrics.gauge_callback("tubetube_download_queue_depth", "Items waiting for a download worker.", lambda: self.download_queue.qsize())
+        self.metrics.gauge_callback("tubetube_workers", "Download worker threads.", lambda: {("target",): self.worker_pool.size, ("running",): self.worker_pool.worker_count()}, ("state",))
+        self.metrics.gauge_callback("tubetube_active_downloads", "Downloads currently transferring data.", lambda: sum(1 for state in list(self.progress_ticker.states.values()) if not state.finished))
+        self.metrics.gauge_callback("tubetube_download_speed_bytes", "Current download speed in bytes per second.", lambda: self.progress_ticker.total_speed())
+        self.metrics.gauge_callback("tubetube_item_download_speed_bytes", "Current download speed per item in bytes per second.", self._item_speeds, ("id",))
+        self.metrics.gauge_callback("tubetube_bandwidth_limit_bytes", "Total bandwidth limit in bytes per second, 0 when unlimited.", lambda: self.bandwidth.limit)
+        self.metrics.gauge_callback("tubetube_extraction_queue_depth", "URLs waiting for metadata extraction.", lambda: self.extraction_pool.stats()["queue_depth"])
+        self.metrics.counter_callback("tubetube_extractions_total", "Finished metadata extractions.", self._extraction_totals, ("result",))
+        self.metrics.counter_callback("tubetube_metadata_cache_requests_total", "Metadata cache lookups.", self._metadata_cache_totals, ("result",))
+        self.metrics.gauge_callback("tubetube_search_index_cues", "Subtitle cues in the search index.", lambda: self.search_index.stats()["cues"] if self.search_index else 0)
+        self.metrics.gauge_callback("tubetube_transcript_queue_depth", "Downloads waiting for transcript writing.", lambda: self.transcript_pool.stats()["queue_depth"] if self.transcript_pool else 0)
+        self.metrics.gauge_callback("tubetube_postprocess_queue_depth", "Downloads waiting for post-processing.", lambda: self.postprocess_pool.stats()["queue_depth"] if self.split_postprocessing else 0)
+
+    def _count_items_by_status(self):
+        counts = {}
+        for item in list(self.all_items.values()):
+            status = str(item.get("status")).split(":", 1)[0]
+            counts[(status,)] = counts.get((status,), 0) + 1
+        return counts
+
+    def _item_speeds(self):
+        return {(str(download_id),): state.speed or 0 for download_id, state in list(self.progress_ticker.states.items()) if not state.finished}
+
+    def _extraction_totals(self):
+        stats = self.extraction_pool.stats()
+        return {("completed",): stats["completed"], ("failed",): stats["failed"]}
+
+    def _metadata_cache_totals(self):
+        stats = self.metadata_cache.stats() if self.metadata_cache else {"hits": 0, "misses": 0}
+        return {("hit",): stats["hits"], ("miss",): stats["misses"]}
 
-        subtitle_langs_raw = self._get_config_value("SUBTITLE_LANGUAGES", "en")
-        self.subtitle_languages = self._parse_languages(subtitle_langs_raw)
-        logging.info(f"Subtitle Languages: {self.subtitle_languages}")
+    def cleanup_temp_folder(self):
+        try:
+            removable_extensions = (".tmp", ".part", ".webp", ".ytdl", ".png", f".{self.download_options['subtitle_format']}")
+            resumable_stems = tuple(f"{file_stem}." for file_stem in self.resume_manifest.file_stems())
+            orphans = []
+            kept = 0
+            for entry in os.scandir(self.temp_folder):
+                if not entry.is_file() or not (entry.name.endswith(removable_extensions) or ".part-Frag" in entry.name):
+                    continue
+                if resumable_stems and entry.name.startswith(resumable_stems):
+                    kept += 1
+                    continue
+                stat = entry.stat()
+                orphans.append((stat.st_mtime, entry.path, stat.st_size))
 
-        self.subtitle_config = {
-            "subtitlesformat": "best",
-            "subtitleslangs": self.subtitle_languages,
-            "writeautomaticsub": self.allow_auto_subs,
-            "writesubtitles": self.write_subs,
-        }
-        self.subtitle_pps = []
-        if self.write_subs:
-            self.subtitle_pps.append({"key": "FFmpegSubtitlesConvertor", "format": self.subtitle_format, "when": "before_dl"})
-        if self.embed_subs:
-            self.subtitle_pps.append({"key": "FFmpegEmbedSubtitle", "already_have_subtitle": self.write_subs})
+            now = time.time()
+            orphan_bytes = sum(size for _, _, size in orphans)
+            for modified_at, file_path, size in sorted(orphans):
+                if now - modified_at <= self.temp_max_age and orphan_bytes <= self.temp_max_bytes:
+                    continue
+                os.remove(file_path)
+                orphan_bytes -= size
+                logging.info(f"Deleted file: {file_path}")
 
-        self.thread_count = self._get_int("THREAD_COUNT", 4)
-        logging.info(f"Thread Count: {self.thread_count}")
+            logging.info(f"Kept {kept} partial download files for resuming, {orphan_bytes} bytes of other temporary files.")
 
-        for i in range(self.thread_count):
-            worker = threading.Thread(target=self._process_queue, daemon=True, name=f"Worker-{i}")
-            worker.start()
-            logging.info(f"Started thread: {worker.name}")
+        except Exception as e:
+            logging.error(f"Error cleaning up temporary folder: {e}")
 
-        temp_env = os.getenv("TUBETUBE_TEMP_DIR")
-        self.temp_folder = temp_env if temp_env else os.path.expanduser("~/.tubetube/temp")
-        os.makedirs(self.temp_folder, exist_ok=True)
+    def _create_parsing_ydl(self):
+        return yt_dlp.YoutubeDL(dict(self.parsing_opts))
 
-        parsing_opts = {
-            "quiet": True,
-            "no_color": True,
-            "extract_flat": True,
-            "ignore_no_formats_error": True,
-            "force_generic_extractor": False,
-            "cachedir": os.path.join(self.temp_folder, "cache"),
-            "noprogress": True,
-            "no_warnings": True,
-        }
-        if self.proxy:
-            parsing_opts["proxy"] = self.proxy
-        if self.js_runtimes:
-            parsing_opts["js_runtimes"] = self.js_runtimes
-        self.ydl_for_parsing = yt_dlp.YoutubeDL(parsing_opts)
-
-        self.cleanup_temp_folder()
+    def _resolve_config_file_path(self, env_key, file_name):
+        file_path = os.getenv(env_key)
+        if file_path:
+            return file_path
+        config_folder = getattr(self, "config_folder", None)
+        if not config_folder:
+            repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+            config_folder = os.path.join(repo_root, "config")
+        return os.path.join(config_folder, file_name)
+
+    def _restore_jobs(self):
+        restored_items = helpers.run_blocking(self.job_store.load_items)
+        changed_items = []
+        requeued = 0
+        resumable_ids = self.resume_manifest.download_ids()
+        resumed_ids = set()
 
-    def cleanup_temp_folder(self):
-        try:
-            removable_extensions = (".tmp", ".part", ".webp", ".ytdl", ".png", f".{self.subtitle_format}")
-            for file_name in os.listdir(self.temp_folder):
-                file_path = os.path.join(self.temp_folder, file_name)
-                if os.path.isfile(file_path) and file_name.endswith(removable_extensions):
-                    os.remove(file_path)
-                    logging.info(f"Deleted file: {file_path}")
+        with self.lock:
+            for item in restored_items:
+                download_id = item["id"]
+                status = item.get("status")
+                if status in ACTIVE_STATUSES or (status == "Pending" and not item.get("skipped")):
+                    if status != "Pending":
+                        item["status"] = "Pending"
+                        item["progress"] = "0%"
+                        changed_items.append(item)
+                    if download_id in resumable_ids:
+                        resumed_ids.add(download_id)
+                elif status in {"Pending", "Cancelling"}:
+                    item["status"] = "Cancelled"
+                    changed_items.append(item)
+
+                self._register_item(item)
+
+            self.id_counter = itertools.count(max(self.all_items.keys(), default=-1) + 1)
+
+            resume_priority = max((item.get("priority", 0) for item in restored_items), default=0) + 1
+            for download_id in resumed_ids:
+                self.all_items[download_id]["priority"] = resume_priority
+                changed_items.append(self.all_items[download_id])
+
+        helpers.run_blocking(self.job_store.save_items, changed_items)
+
+        for item in restored_items:
+            if item["status"] == "Pending":
+                self._schedule_item(item)
+                requeued += 1
+
+        if self.transcript_pool:
+            for item in restored_items:
+                if item["status"] == "Complete" and item.get("transcript") in {"Queued", "Writing"}:
+                    self._queue_transcripts(item)
+
+        self.resume_manifest.retain(resumed_ids)
+        logging.info(f"Restored {len(restored_items)} items from job store, {requeued} requeued, {len(resumed_ids)} resuming partial downloads.")
+
+    def _folder_concurrency_limits(self):
+        limits = {}
+        for folder_name, download_settings in (getattr(self, "folder_locations", None) or {}).items():
+            try:
+                limit = int(download_settings.get("max_concurrent", 0))
+            except (AttributeError, TypeError, ValueError):
+                continue
+            if limit > 0:
+                limits[folder_name] = limit
+        return limits
 
-        except Exception as e:
-            logging.error(f"Error cleaning up temporary folder: {e}")
+    def _schedule_item(self, item):
+        base_folder = str(item.get("folder_name") or "").split("/", 1)[0]
+        self.download_queue.put(item["id"], item.get("lane"), item.get("priority", 0), base_folder)
 
     def _resolve_ffmpeg_path(self, os_system):
         path = shutil.which("ffmpeg")
@@ -211,6 +469,165 @@ class DownloadManager:
             logging.error(f"App config loading error: {e}")
             return DEFAULT_APP_CONFIG.copy()
 
+    def _read_download_options(self):
+        verbose_ytdlp = self._get_bool("VERBOSE_LOGS", False)
+        logging.info(f"Verbose logging for yt-dlp set to: {verbose_ytdlp}")
+
+        trim_metadata = self._get_bool("TRIM_METADATA", False)
+        logging.info(f"Trim Metadata set to: {trim_metadata}")
+
+        proxy_value = self._get_str("PROXY", "")
+        proxy = proxy_value.strip() if isinstance(proxy_value, str) else ""
+        proxy = proxy or None
+        if proxy:
+            logging.info("Proxy enabled for yt-dlp requests.")
+        else:
+            logging.info("Proxy disabled for yt-dlp requests.")
+
+        js_runtimes = self._parse_js_runtimes(self._get_config_value("JS_RUNTIMES", ""))
+        if not js_runtimes:
+            js_runtimes = self._auto_detect_js_runtimes()
+        if js_runtimes:
+            logging.info(f"JS runtimes for yt-dlp: {js_runtimes}")
+        else:
+            logging.info("No JS runtime configured for yt-dlp.")
+
+        preferred_language = self._get_str("PREFERRED_LANGUAGE", "en")
+        logging.info(f"Preferred Audio Language: {preferred_language}")
+
+        preferred_audio_codec = self._get_str("PREFERRED_AUDIO_CODEC", "aac")
+        logging.info(f"Preferred Audio Codec: {preferred_audio_codec}")
+
+        preferred_video_codec = self._get_str("PREFERRED_VIDEO_CODEC", "vp9")
+        logging.info(f"Preferred Video Codec: {preferred_video_codec}")
+
+        preferred_video_ext = self._get_str("PREFERRED_VIDEO_EXT", "mp4")
+        logging.info(f"Preferred Video Ext: {preferred_video_ext}")
+
+        embed_subs = self._get_bool("EMBED_SUBS", False)
+        logging.info(f"Embed Subtitles: {embed_subs}")
+
+        write_subs = self._get_bool("WRITE_SUBS", False)
+        logging.info(f"Write Subtitles: {write_subs}")
+
+        allow_auto_subs = self._get_bool("ALLOW_AUTO_SUBS", True)
+        logging.info(f"Automatic Subtitles Enabled: {allow_auto_subs}")
+
+        subtitle_format = self._get_str("SUBTITLE_FORMAT", "vtt")
+        logging.info(f"Subtitle Format: {subtitle_format}")
+
+        subtitle_langs_raw = self._get_config_value("SUBTITLE_LANGUAGES", "en")
+        subtitle_languages = self._parse_languages(subtitle_langs_raw)
+        logging.info(f"Subtitle Languages: {subtitle_languages}")
+
+        subtitle_config = {
+            "subtitlesformat": "best",
+            "subtitleslangs": subtitle_languages,
+            "writeautomaticsub": allow_auto_subs,
+            "writesubtitles": write_subs,
+        }
+        subtitle_pps = []
+        if write_subs:
+            subtitle_pps.append({"key": "FFmpegSubtitlesConvertor", "format": subtitle_format, "when": "before_dl"})
+        if embed_subs:
+            subtitle_pps.append({"key": "FFmpegEmbedSubtitle", "already_have_subtitle": write_subs})
+
+        return {
+            "verbose_ytdlp": verbose_ytdlp,
+            "trim_metadata": trim_metadata,
+            "proxy": proxy,
+            "js_runtimes": js_runtimes,
+            "preferred_language": preferred_language,
+            "preferred_audio_codec": preferred_audio_codec,
+            "preferred_video_codec": preferred_video_codec,
+            "preferred_video_ext": preferred_video_ext,
+            "embed_subs": embed_subs,
+            "write_subs": write_subs,
+            "subtitle_format": subtitle_format,
+            "subtitle_config": subtitle_config,
+            "subtitle_pps": subtitle_pps,
+        }
+
+    def _on_config_change(self, path):
+        if path == self.app_config_path:
+            self.reload_app_config()
+        elif path == getattr(self, "settings_file_path", None) and self.reload_settings():
+            self.download_queue.set_folder_limits(self._folder_concurrency_limits())
+            self.socketio.emit("update_folder_locations", {"audio": self.audio_locations, "video": self.video_locations})
+
+    def reload_app_config(self):
+        try:
+            with open(self.app_config_path, "r") as file:
+                app_config = yaml.safe_load(file) or DEFAULT_APP_CONFIG.copy()
+            self._validate_app_config(app_config)
+        except (OSError, ValueError, yaml.YAMLError) as e:
+            logging.error(f"Ignoring invalid {self.app_config_path}, keeping the current settings: {e}")
+            return False
+        if app_config == self.app_config:
+            return False
+
+        previous_config = self.app_config
+        previous_options = self.download_options
+        changed = {str(key).upper() for key in set(app_config) | set(previous_config) if app_config.get(key) != previous_config.get(key)}
+        logging.info(f"Reloading {self.app_config_path}, changed: {sorted(changed)}")
+
+        # Downloads build their yt-dlp options once when they start, so swapping the snapshot leaves running ones untouched.
+        self.app_config = app_config
+        self.download_options = self._read_download_options()
+        self.parsing_opts = self._build_parsing_opts(self.download_options)
+        if self.download_options["proxy"] != previous_options["proxy"] or self.download_options["js_runtimes"] != previous_options["js_runtimes"]:
+            self.extraction_pool.refresh()
+
+        self.playlist_streaming = self._get_bool("PLAYLIST_STREAMING", True)
+        self.playlist_chunk_size = max(self._get_int("PLAYLIST_CHUNK_SIZE", 50), 1)
+        if "THREAD_COUNT" in changed:
+            self.set_thread_count(self._get_int("THREAD_COUNT", self.thread_count))
+        if {"BANDWIDTH_LIMIT", "BANDWIDTH_SCHEDULE"} & changed:
+            try:
+                bandwidth_limit = parse_rate(self._get_config_value("BANDWIDTH_LIMIT", ""))
+            except ValueError:
+                bandwidth_limit = 0
+            self.bandwidth.set_defaults(bandwidth_limit, parse_schedule(self._get_config_value("BANDWIDTH_SCHEDULE", [])))
+
+        restart_required = sorted(changed - RELOADABLE_APP_CONFIG)
+        if restart_required:
+            logging.warning(f"Changes to {restart_required} take effect after a restart.")
+        return True
+
+    def _validate_app_config(self, app_config):
+        if not isinstance(app_config, dict):
+            raise ValueError("expected a mapping of settings")
+        for key, default in DEFAULT_APP_CONFIG.items():
+            value = app_config.get(key, app_config.get(key.lower()))
+            if value is None or value == "" or isinstance(default, (str, list)):
+                continue
+            if isinstance(default, bool):
+                if self._parse_bool(value, None) is None:
+                    raise ValueError(f"{key} must be true or false, got {value!r}")
+                continue
+            try:
+                type(default)(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"{key} must be a number, got {value!r}")
+        parse_rate(app_config.get("BANDWIDTH_LIMIT", app_config.get("bandwidth_limit", "")))
+
+    def _build_parsing_opts(self, options):
+        parsing_opts = {
+            "quiet": True,
+            "no_color": True,
+            "extract_flat": True,
+            "ignore_no_formats_error": True,
+            "force_generic_extractor": False,
+            "cachedir": os.path.join(self.temp_folder, "cache"),
+            "noprogress": True,
+            "no_warnings": True,
+        }
+        if options["proxy"]:
+            parsing_opts["proxy"] = options["proxy"]
+        if options["js_runtimes"]:
+            parsing_opts["js_runtimes"] = options["js_runtimes"]
+        return parsing_opts
+
     def _get_config_value(self, env_key, default):
         env_value = os.getenv(env_key)
         if env_value is not None:
@@ -250,6 +667,13 @@ class DownloadManager:
         except (TypeError, ValueError):
             return default
 
+    def _get_float(self, env_key, default):
+        raw_value = self._get_config_value(env_key, default)
+        try:
+            return float(raw_value)
+        except (TypeError, ValueError):
+            return default
+
     def _get_str(self, env_key, default):
         raw_value = self._get_config_value(env_key, default)
         if raw_value is None:
@@ -318,88 +742,259 @@ class DownloadManager:
             url = re.sub(r"&list=.*", "", url)
 
         with self.lock:
-            parsed_identifier = helpers.parse_video_id(url)
-            if any(item["url"] == url or item["video_identifier"] == parsed_identifier for item in self.all_items.values()):
+            if self._find_duplicate(url) is not None:
                 logging.info(f"URL {url} is already in the queue or being downloaded.")
                 self.socketio.emit("toast", {"title": "Duplicate URL", "body": f"The video '{url}' is already in the queue or being processed."})
                 return
 
+        item_info["lane"] = uuid.uuid4().hex
+        try:
+            priority = int(item_info.get("priority") or 0)
+        except (TypeError, ValueError):
+            priority = 0
+        item_info["priority"] = priority
+
         try:
-            yt_info_dict = self.ydl_for_parsing.extract_info(url, download=False)
+            self.extraction_pool.submit(self._extract_and_enqueue, url, item_info)
+        except queue.Full:
+            logging.warning(f"Extraction queue is full, rejected URL: {url}")
+            self.socketio.emit("toast", {"title": "Too many pending submissions", "body": f"The video '{url}' was not added. Please try again shortly."})
+
+    def _extract_unprocessed(self, ydl, url):
+        yt_info_dict = ydl.extract_info(url, download=False, process=False)
+        for _ in range(5):
+            if yt_info_dict.get("_type") not in ("url", "url_transparent"):
+                break
+            yt_info_dict = ydl.extract_info(yt_info_dict["url"], ie_key=yt_info_dict.get("ie_key"), download=False, process=False)
+        return yt_info_dict
+
+    def _extract_and_enqueue(self, ydl, url, item_info):
+        extraction_started = time.monotonic()
+        cache_key = helpers.extractor_cache_key(url) if self.metadata_cache else None
+        try:
+            yt_info_dict = self.metadata_cache.get(cache_key) if cache_key else None
+            from_cache = yt_info_dict is not None
+            if from_cache:
+                logging.info(f"Using cached info for {url}")
+            elif self.playlist_streaming:
+                yt_info_dict = self._extract_unprocessed(ydl, url)
+            else:
+                yt_info_dict = ydl.extract_info(url, download=False)
+            item_info["extraction_seconds"] = round(time.monotonic() - extraction_started, 3)
+            self.phase_seconds.observe(item_info["extraction_seconds"], "extraction")
             logging.info(f"Extracted info for {yt_info_dict.get('title', 'unknown')}")
 
         except Exception as e:
             logging.error(f"Error extracting info: {e}")
             logging.error(f"Nothing Added to Queue")
             self.socketio.emit("toast", {"title": "Failed to add item to the queue.", "body": f"Please check the URL.\n\n {str(e)}"})
-            return
+            return False
 
         if "entries" in yt_info_dict:
             playlist_name = re.sub(r'[<>:"/\\|?*]', "-", yt_info_dict.get("title"))
             item_info["folder_name"] = f'{item_info.get("folder_name")}/{playlist_name}'
             logging.info(f"Adding playlist: {playlist_name} to queue")
-            for entry in yt_info_dict["entries"]:
-                self._enqueue_item(entry, item_info)
+            collected_entries = [] if cache_key and not from_cache else None
+            try:
+                added, skipped = self._enqueue_playlist_entries(yt_info_dict["entries"], item_info, collected_entries)
+            except Exception as e:
+                logging.error(f"Error reading playlist entries for {playlist_name}: {e}")
+                self.socketio.emit("toast", {"title": "Playlist partially added", "body": f"Reading '{playlist_name}' stopped early.\n\n {str(e)}"})
+                return False
+            logging.info(f"Added {added} items from playlist: {playlist_name}")
+            if collected_entries:
+                playlist_info = {key: yt_info_dict.get(key) for key in ("_type", "id", "title", "extractor", "extractor_key", "webpage_url")}
+                playlist_info["entries"] = collected_entries
+                self.metadata_cache.put(cache_key, playlist_info, "playlist")
+            if skipped:
+                self.socketio.emit("toast", {"title": "Playlist entries skipped", "body": f"{skipped} videos from '{playlist_name}' were already downloaded, already in the queue or could not be added."})
         else:
-            self._enqueue_item(yt_info_dict, item_info)
+            if cache_key and not from_cache:
+                self.metadata_cache.put(cache_key, yt_info_dict, "video")
+            if not self._enqueue_item(yt_info_dict, item_info):
+                self.socketio.emit("toast", {"title": "Duplicate URL", "body": f"The video '{url}' is already in the queue or being processed."})
+
+    def _find_duplicate(self, url):
+        download_id = self.url_index.get(helpers.normalize_url(url))
+        if download_id is None:
+            parsed_identifier = helpers.parse_video_id(url)
+            if parsed_identifier:
+                download_id = self.video_id_index.get(parsed_identifier)
+        return download_id
+
+    def _register_item(self, item):
+        download_id = item["id"]
+        self.all_items[download_id] = item
+        self.stop_signals[download_id] = threading.Event()
+        if item.get("url"):
+            self.url_index[helpers.normalize_url(item["url"])] = download_id
+        if item.get("video_identifier"):
+            self.video_id_index[item["video_identifier"]] = download_id
+
+    def _unregister_item(self, download_id):
+        item = self.all_items.pop(download_id, None)
+        self.stop_signals.pop(download_id, None)
+        if not item:
+            return
+        url_key = helpers.normalize_url(item.get("url"))
+        if self.url_index.get(url_key) == download_id:
+            del self.url_index[url_key]
+        video_identifier = item.get("video_identifier")
+        if video_identifier and self.video_id_index.get(video_identifier) == download_id:
+            del self.video_id_index[video_identifier]
 
     def _enqueue_item(self, yt_info_dict, item_info):
+        added, _ = self._enqueue_items([yt_info_dict], item_info, from_playlist=False)
+        return added == 1
+
+    def _enqueue_items(self, entries, item_info, from_playlist=True):
+        # Only playlist entries are checked against the archive, a single URL submitted explicitly is always downloaded.
+        archive_kind = self._archive_kind(item_info)
+        added_items = []
+        skipped = 0
         try:
-            download_id = max(self.all_items.keys(), default=-1) + 1
-            url = yt_info_dict.get("webpage_url", yt_info_dict.get("url"))
-            item = {
-                "video_identifier": yt_info_dict.get("id"),
-                "id": download_id,
-                "title": yt_info_dict.get("title"),
-                "url": url,
-                "status": "Pending",
-                "progress": "0%",
-                "folder_name": item_info.get("folder_name"),
-                "download_settings": item_info.get("download_settings"),
-                "audio_only": item_info.get("audio_only"),
-                "skipped": False,
-            }
             with self.lock:
-                self.all_items[download_id] = item
-                self.stop_signals[download_id] = threading.Event()
-            self.download_queue.put(download_id)
-            logging.info(f'Queued item: {item["title"]} with ID: {download_id}')
-            self.socketio.emit("update_download_list", self.all_items)
+                for yt_info_dict in entries:
+                    url = yt_info_dict.get("webpage_url", yt_info_dict.get("url"))
+                    if not url or self._find_duplicate(url) is not None:
+                        logging.info(f"URL {url} is already in the queue or being downloaded.")
+                        skipped += 1
+                        continue
+                    archive_id = helpers.archive_id(yt_info_dict) if self.download_archive else None
+                    if from_playlist and archive_id and self.download_archive.contains(archive_id, archive_kind):
+                        logging.info(f"URL {url} is in the download archive.")
+                        skipped += 1
+                        continue
+                    download_id = next(self.id_counter)
+                    item = {
+                        "video_identifier": yt_info_dict.get("id"),
+                        "id": download_id,
+                        "title": yt_info_dict.get("title"),
+                        "url": url,
+                        "status": "Pending",
+                        "progress": "0%",
+                        "folder_name": item_info.get("folder_name"),
+                        "download_settings": item_info.get("download_settings"),
+                        "audio_only": item_info.get("audio_only"),
+                        "skipped": False,
+                        "lane": item_info.get("lane"),
+                        "priority": item_info.get("priority", 0),
+                        "extraction_seconds": item_info.get("extraction_seconds"),
+                        "archive_id": archive_id,
+                        "from_playlist": from_playlist,
+                    }
+                    self._register_item(item)
+                    added_items.append(item)
+
+            self.job_store.save_items(added_items)
+            for item in added_items:
+                self._schedule_item(item)
+                self.broadcaster.item_added(item)
+                logging.info(f'Queued item: {item["title"]} with ID: {item["id"]}')
 
         except Exception as e:
-            logging.error(f"Error enqueuing item: {e}")
-            logging.warning(f'Failed to add: {yt_info_dict.get("title")} to the queue.')
+            logging.error(f"Error enqueuing items: {e}")
+            logging.warning(f"Failed to add {len(entries)} items to the queue.")
+            return 0, len(entries)
 
-        else:
-            logging.info(f'Added: {yt_info_dict.get("title")} to queue.')
+        return len(added_items), skipped
+
+    def _enqueue_playlist_entries(self, entries, item_info, collected_entries=None):
+        added = skipped = seen = 0
+        chunk = []
+        for entry in helpers.iter_playlist_entries(entries):
+            if not entry:
+                continue
+            if collected_entries is not None:
+                # Large playlists are not cached, their entries would stay in memory until the whole list is read.
+                if len(collected_entries) < self.metadata_cache_playlist_max_entries:
+                    collected_entries.append(entry)
+                else:
+                    collected_entries.clear()
+                    collected_entries = None
+            seen += 1
+            chunk.append(entry)
+            if seen == 1 or len(chunk) >= self.playlist_chunk_size:
+                chunk_added, chunk_skipped = self._enqueue_items(chunk, item_info)
+                added += chunk_added
+                skipped += chunk_skipped
+                chunk = []
+        if chunk:
+            chunk_added, chunk_skipped = self._enqueue_items(chunk, item_info)
+            added += chunk_added
+            skipped += chunk_skipped
+        return added, skipped
 
     def _process_queue(self):
-        while True:
-            try:
-                download_id = self.download_queue.get()
-                logging.info(f"Processing download ID: {download_id} in thread {threading.current_thread().name}")
+        download_id = self.download_queue.get(timeout=1)
+        if download_id is None:
+            return
 
-                if self.all_items[download_id]["skipped"]:
-                    self.all_items[download_id]["status"] = "Cancelled"
-                    logging.info(f"Item {download_id} marked as skipped.")
-                    self.socketio.emit("update_download_item", {"item": self.all_items[download_id]})
+        try:
+            logging.info(f"Processing download ID: {download_id} in thread {threading.current_thread().name}")
 
-                else:
+            if self.all_items[download_id]["skipped"]:
+                self.all_items[download_id]["status"] = "Cancelled"
+                self.job_store.save_item(self.all_items[download_id])
+                logging.info(f"Item {download_id} marked as skipped.")
+                self.broadcaster.item_updated(self.all_items[download_id])
+
+            else:
+                profile_path = self.tracer.profile_path(download_id, "download") if self.worker_mode == "thread" else None
+                with ProfileSession(profile_path):
                     self._download_item(download_id)
 
-            except Exception as e:
-                logging.error(f"Processing error for ID {download_id}: {e}")
+        except Exception as e:
+            logging.error(f"Processing error for ID {download_id}: {e}")
 
-            finally:
-                self.download_queue.task_done()
-                if self.download_queue.empty():
-                    logging.info(f"Queue is empty.")
+        finally:
+            self.download_queue.task_done(download_id)
+            if self.download_queue.empty():
+                logging.info(f"Queue is empty.")
 
-    def _download_item(self, download_id):
-        item = self.all_items[download_id]
-        item["status"] = "In Progress"
-        self.socketio.emit("update_download_item", {"item": item})
+    def set_thread_count(self, count, adaptive=None):
+        try:
+            count = int(count)
+        except (TypeError, ValueError):
+            logging.warning(f"Ignoring invalid thread count: {count}")
+            return self.worker_status()
+        if count > 0:
+            self.thread_count = self.worker_pool.resize(count)
+        if adaptive is not None and self.adaptive_concurrency:
+            self.adaptive_concurrency.enabled = bool(adaptive)
+            logging.info(f"Adaptive concurrency enabled: {self.adaptive_concurrency.enabled}")
+        return self.worker_status()
+
+    def shutdown(self, timeout=5):
+        if self.config_watcher:
+            self.config_watcher.stop()
+        if self.adaptive_concurrency:
+            self.adaptive_concurrency.enabled = False
+        if not self.worker_pool.stop(timeout):
+            logging.warning(f"{self.worker_pool.worker_count()} download threads were still busy after {timeout}s.")
+        if self.search_index:
+            self.search_index.close()
+        self.job_store.close()
+        logging.info("Download manager stopped.")
+
+    def set_bandwidth_limit(self, limit):
+        try:
+            limit = None if limit is None else parse_rate(limit)
+        except ValueError as e:
+            logging.warning(str(e))
+            return self.bandwidth.status()
+        return self.bandwidth.set_limit(limit)
+
+    def worker_status(self):
+        return {
+            "target": self.worker_pool.size,
+            "running": self.worker_pool.worker_count(),
+            "adaptive": bool(self.adaptive_concurrency and self.adaptive_concurrency.enabled),
+            "queued": self.download_queue.qsize(),
+        }
 
+    def _build_ydl_opts(self, item, options=None):
+        options = options or self.download_options
         download_settings = item.get("download_settings")
         folder_name = item.get("folder_name")
 
@@ -411,17 +1006,16 @@ class DownloadManager:
         else:
             download_format = f"{video_format_id}+{audio_format_id}/bestvideo+bestaudio/best"
 
-        item_title = re.sub(r'[<>:"/\\|?*]', "-", item.get("title"))
+        item_title = self._item_file_stem(item)
         final_path = os.path.join(getattr(self, "data_folder", "/data"), folder_name)
 
         ydl_opts = {
             "ignore_no_formats_error": True,
             "noplaylist": True,
             "outtmpl": f"{item_title}.%(ext)s",
-            "progress_hooks": [lambda d: self._progress_hook(d, download_id)],
             "ffmpeg_location": self.ffmpeg_location,
             "writethumbnail": True,
-            "quiet": not self.verbose_ytdlp,
+            "quiet": not options["verbose_ytdlp"],
             "extract_flat": True,
             "format": download_format,
             "updatetime": False,
@@ -429,14 +1023,14 @@ class DownloadManager:
             "extractor_args": {"youtubetab": {"skip": ["authcheck"]}},
             "paths": {"home": final_path, "temp": self.temp_folder},
             "no_overwrites": True,
-            "verbose": self.verbose_ytdlp,
+            "verbose": options["verbose_ytdlp"],
             "no_mtime": True,
-            "format_sort": [f"lang:{self.preferred_language}", f"acodec:{self.preferred_audio_codec}", "quality", "size", f"vcodec:{self.preferred_video_codec}", f"vext:{self.preferred_video_ext}"],
+            "format_sort": [f"lang:{options['preferred_language']}", f"acodec:{options['preferred_audio_codec']}", "quality", "size", f"vcodec:{options['preferred_video_codec']}", f"vext:{options['preferred_video_ext']}"],
         }
-        if self.proxy:
-            ydl_opts["proxy"] = self.proxy
-        if self.js_runtimes:
-            ydl_opts["js_runtimes"] = self.js_runtimes
+        if options["proxy"]:
+            ydl_opts["proxy"] = options["proxy"]
+        if options["js_runtimes"]:
+            ydl_opts["js_runtimes"] = options["js_runtimes"]
 
         post_processors = [
             {"key": "SponsorBlock", "categories": ["sponsor"]},
@@ -457,68 +1051,327 @@ class DownloadManager:
         if self.cookies_file:
             ydl_opts["cookiefile"] = self.cookies_file
 
-        if self.write_subs or self.embed_subs:
-            ydl_opts.update(self.subtitle_config)
-            post_processors.extend(self.subtitle_pps)
+        if options["write_subs"] or options["embed_subs"]:
+            ydl_opts.update(options["subtitle_config"])
+            post_processors.extend(options["subtitle_pps"])
 
         ydl_opts["postprocessors"] = post_processors
+        return ydl_opts
+
+    def _item_file_stem(self, item):
+        return re.sub(r'[<>:"/\\|?*]', "-", item.get("title"))
 
+    def _download_item(self, download_id):
+        item = self.all_items[download_id]
+        item["status"] = "In Progress"
+        self._save_item(item)
+        self.progress_ticker.track(download_id, item)
+        trace = self.tracer.start(download_id)
+        if item.get("extraction_seconds") is not None:
+            trace.record("extraction", item["extraction_seconds"])
+        trace.begin("prepare")
+        set_ffmpeg_listener(lambda postprocessor, seconds: trace.record("ffmpeg", seconds, postprocessor=postprocessor))
+
+        options = self.download_options
+        ydl_opts = self._build_ydl_opts(item, options)
+        self.resume_manifest.add(download_id, item, self._item_file_stem(item))
+        cached_info_path = None
+        # Playlist entries are cached as part of their playlist, never under their own key.
+        if self.metadata_cache and not item.get("from_playlist"):
+            cached_info_path = self.metadata_cache.get_path(helpers.extractor_cache_key(item["url"]))
+
+        ydl = None
+        post_processing_deferred = False
         try:
             logging.info(f'Starting {threading.current_thread().name} Download: {item.get("title")}')
-            ydl = yt_dlp.YoutubeDL(ydl_opts)
-            if self.trim_metadata:
-                ydl.add_post_processor(helpers.TrimDescriptionPP(), when="before_dl")
-            result = ydl.download([item["url"]])
-            item["progress"] = "Done" if result == 0 else "Incomplete"
-            item["status"] = "Complete"
-            logging.info(f'Finished {threading.current_thread().name} Download: {item.get("title")}')
+            download_started = time.monotonic()
+            if self.worker_mode == "process":
+                result = self._download_in_process(download_id, item, ydl_opts, cached_info_path, options["trim_metadata"])
+            else:
+                ydl_opts["progress_hooks"] = [lambda d: self._progress_hook(d, download_id)]
+                ydl_opts["postprocessor_hooks"] = [lambda d: self._postprocessor_hook(d, download_id)]
+                ydl = DeferredPostProcessingYDL(ydl_opts, defer_post_processing=self.split_postprocessing)
+                if options["trim_metadata"]:
+                    ydl.add_post_processor(helpers.TrimDescriptionPP(), when="before_dl")
+                if cached_info_path:
+                    logging.info(f'Reusing cached info for: {item.get("title")}')
+                    result = ydl.download_with_info_file(cached_info_path)
+                else:
+                    result = ydl.download([item["url"]])
+            item["download_seconds"] = round(time.monotonic() - download_started, 2)
+            self.phase_seconds.observe(item["download_seconds"], "download")
+            logging.info(f'Finished {threading.current_thread().name} Download: {item.get("title")} in {item["download_seconds"]}s')
+
+            if ydl and ydl.deferred_post_processing:
+                item["status"] = "Queued for Processing"
+                self._save_item(item)
+                trace.begin("postprocess_queue")
+                self.postprocess_pool.submit(self._post_process_item, download_id, item, ydl, result)
+                post_processing_deferred = True
+            else:
+                self._complete_item(item, result)
 
         except DownloadCancelledException:
             item["status"] = "Cancelled"
             logging.info(f'Download cancelled: {item.get("title")}')
 
         except Exception as e:
-            item["status"] = f"Failed: {type(e).__name__}"
-            item["progress"] = "Error"
-            logging.error(f'Error downloading: {item.get("title")} - {str(e)}')
+            self._fail_item(item, e)
+
+        finally:
+            self.progress_ticker.untrack(download_id)
+            self.bandwidth.release(download_id)
+            set_ffmpeg_listener(None)
+            if not post_processing_deferred:
+                self.resume_manifest.remove(download_id)
+                item["trace"] = trace.summary()
+                self._save_item(item)
+                if ydl:
+                    ydl.close()
+
+    def _download_in_process(self, download_id, item, ydl_opts, cached_info_path, trim_metadata):
+        stop_signal = self.stop_signals.get(download_id)
+        if stop_signal is None:
+            raise DownloadCancelledException("Cancelled")
+        job = {
+            "ydl_opts": ydl_opts,
+            "url": item["url"],
+            "info_file": cached_info_path,
+            "trim_metadata": trim_metadata,
+            "profile_path": self.tracer.profile_path(download_id, "process"),
+        }
+        worker = DownloadProcess(job)
+        logging.info(f'Download process {worker.process.pid} started for: {item.get("title")}')
+        last_message_at = time.monotonic()
+        cancel_sent_at = None
+        sent_rate = 0
+        try:
+            while True:
+                now = time.monotonic()
+                if stop_signal.is_set() and cancel_sent_at is None:
+                    worker.send({"type": "cancel"})
+                    cancel_sent_at = now
+                if cancel_sent_at is not None and now - cancel_sent_at > 10:
+                    raise DownloadCancelledException("Cancelled")
+                if now - last_message_at > self.download_hang_timeout:
+                    raise WorkerProcessError("WorkerHung", f"No progress from download process for {self.download_hang_timeout}s")
+
+                try:
+                    message = worker.receive(timeout=1)
+                except queue.Empty:
+                    continue
+                if message is None:
+                    raise WorkerProcessError("WorkerCrashed", f"Download process exited with code {worker.exit_code()}")
+                last_message_at = time.monotonic()
+
+                message_type = message.get("type")
+                if message_type == "progress":
+                    try:
+                        self._record_progress(message["data"], download_id)
+                    except DownloadCancelledException:
+                        continue
+                    rate = int(self.bandwidth.allocation_for(download_id))
+                    if rate != sent_rate:
+                        worker.send({"type": "rate", "bytes_per_second": rate})
+                        sent_rate = rate
+                elif message_type == "postprocess":
+                    self._postprocessor_hook(message, download_id)
+                    if message.get("status") == "started" and item["status"] != "Post-processing":
+                        item["status"] = "Post-processing"
+                        self._broadcast_item(item)
+                elif message_type == "ffmpeg":
+                    trace = self.tracer.get(download_id)
+                    if trace:
+                        trace.record("ffmpeg", message.get("seconds") or 0, postprocessor=message.get("postprocessor"))
+                elif message_type == "done":
+                    return message.get("result")
+                elif message_type == "cancelled":
+                    raise DownloadCancelledException("Cancelled")
+                elif message_type == "error":
+                    raise WorkerProcessError(message.get("error_type", "Exception"), message.get("message", ""))
+        finally:
+            worker.stop()
+
+    def _post_process_item(self, download_id, item, ydl, result):
+        post_processing_started = time.monotonic()
+        trace = self.tracer.get(download_id) or self.tracer.start(download_id)
+        trace.end("postprocess_queue")
+        set_ffmpeg_listener(lambda postprocessor, seconds: trace.record("ffmpeg", seconds, postprocessor=postprocessor))
+        try:
+            stop_signal = self.stop_signals.get(download_id)
+            if stop_signal is None or stop_signal.is_set():
+                raise DownloadCancelledException("Cancelled")
+
+            item["status"] = "Post-processing"
+            self._broadcast_item(item)
+            logging.info(f'Post-processing in {threading.current_thread().name}: {item.get("title")}')
+            with ProfileSession(self.tracer.profile_path(download_id, "postprocess")):
+                ydl.run_deferred_post_processing()
+            item["postprocess_seconds"] = round(time.monotonic() - post_processing_started, 2)
+            self.phase_seconds.observe(item["postprocess_seconds"], "postprocess")
+            logging.info(f'Finished post-processing: {item.get("title")} in {item["postprocess_seconds"]}s')
+            self._complete_item(item, result)
+
+        except DownloadCancelledException:
+            item["status"] = "Cancelled"
+            logging.info(f'Post-processing cancelled: {item.get("title")}')
+
+        except Exception as e:
+            self._fail_item(item, e)
 
         finally:
-            self.socketio.emit("update_download_item", {"item": item})
+            set_ffmpeg_listener(None)
+            self.resume_manifest.remove(download_id)
+            item["trace"] = trace.summary()
+            self._save_item(item)
             ydl.close()
 
+    def _complete_item(self, item, result):
+        item["progress"] = "Done" if result == 0 else "Incomplete"
+        item["status"] = "Complete"
+        if self.download_archive and result == 0:
+            self.download_archive.add(self._item_archive_id(item), self._archive_kind(item))
+        if self.search_index:
+            self._index_subtitles(item)
+        if self.transcript_pool and result == 0:
+            self._queue_transcripts(item)
+
+    def _item_output_files(self, item, extension):
+        final_path = os.path.join(getattr(self, "data_folder", "/data"), item.get("folder_name") or "")
+        prefix = f"{self._item_file_stem(item)}."
+        try:
+            return [entry.path for entry in os.scandir(final_path) if entry.is_file() and entry.name.startswith(prefix) and entry.name.endswith(extension)]
+        except OSError:
+            return []
+
+    def _index_subtitles(self, item):
+        for file_path in self._item_output_files(item, ".vtt"):
+            self.search_index.enqueue_file(file_path, item.get("title"), item.get("folder_name"), item.get("url"), item.get("video_identifier"))
+
+    def _queue_transcripts(self, item):
+        if self.transcript_pool.try_submit(self._write_transcripts, item):
+            item["transcript"] = "Queued"
+        else:
+            item["transcript"] = "Skipped"
+            logging.warning(f'Transcript queue is full, skipped transcript for: {item.get("title")}')
+
+    def _write_transcripts(self, item):
+        subtitle_files = self._item_output_files(item, ".vtt")
+        if not subtitle_files:
+            self._set_transcript_status(item, "No subtitles")
+            return
+        self._set_transcript_status(item, "Writing")
+        started = time.monotonic()
+        try:
+            for file_path in subtitle_files:
+                heading = item.get("title") if self.transcript_format == "md" else None
+                self.transcript_pipeline.write_transcript(file_path, transcript_path_for(file_path, self.transcript_format), heading)
+        except Exception as e:
+            logging.error(f'Error writing transcript for: {item.get("title")} - {e}')
+            self._set_transcript_status(item, f"Failed: {type(e).__name__}")
+            return
+        elapsed = round(time.monotonic() - started, 2)
+        self.phase_seconds.observe(elapsed, "transcript")
+        logging.info(f'Wrote {len(subtitle_files)} transcripts for: {item.get("title")} in {elapsed}s')
+        self._set_transcript_status(item, "Done")
+
+    def _set_transcript_status(self, item, status):
+        item["transcript"] = status
+        self._save_item(item)
+
+    def _save_item(self, item):
+        return bool(self._save_items([item]))
+
+    def _save_items(self, items):
+        # Copy under the lock and write after releasing it. Running downloads finish after remove_items, so rows for
+        # items removed while the write was in flight are deleted again instead of being left in the job store.
+        with self.lock:
+            saved = [item for item in items if item.get("id") in self.all_items]
+            snapshots = [dict(item) for item in saved]
+        self.job_store.save_items(snapshots)
+        with self.lock:
+            removed_ids = [item["id"] for item in saved if item["id"] not in self.all_items]
+        if removed_ids:
+            self.job_store.delete_items(removed_ids)
+            saved = [item for item in saved if item["id"] not in removed_ids]
+        for item in saved:
+            self.broadcaster.item_updated(item)
+        return saved
+
+    def _broadcast_item(self, item):
+        if item.get("id") in self.all_items:
+            self.broadcaster.item_updated(item)
+
+    def search_transcripts(self, query, limit=50):
+        if not self.search_index:
+            return []
+        return self.search_index.search(query, limit)
+
+    def _fail_item(self, item, error):
+        error_type = getattr(error, "error_type", type(error).__name__)
+        self.failure_counter.inc(error_type)
+        item["status"] = f"Failed: {error_type}"
+        item["progress"] = "Error"
+        if self.adaptive_concurrency and helpers.is_throttle_error(error):
+            self.adaptive_concurrency.record_throttle()
+        logging.error(f'Error downloading: {item.get("title")} - {str(error)}')
+
     def _progress_hook(self, d, download_id):
-        if self.stop_signals[download_id].is_set():
+        throttle_seconds = self._record_progress(d, download_id)
+        stop_signal = self.stop_signals.get(download_id)
+        if stop_signal is None or (throttle_seconds > 0 and stop_signal.wait(throttle_seconds)):
             raise DownloadCancelledException("Cancelled")
 
-        if d["status"] == "downloading":
-            with self.lock:
-                item = self.all_items[download_id]
-                self._log_video_format_if_needed(item, d)
-
-                if random.randint(1, 10) != 1:
-                    return
+    def _record_progress(self, d, download_id):
+        stop_signal = self.stop_signals.get(download_id)
+        if stop_signal is None or stop_signal.is_set():
+            raise DownloadCancelledException("Cancelled")
 
-                live = d.get("info_dict", {}).get("is_live", False)
-                if live:
-                    fragment_index_str = d.get("fragment_index", 1)
-                    elapsed_str = re.sub(r"\x1b\[[0-9;]*m", "", d.get("_elapsed_str", "")).strip()
-                    progress_message = f"Frag: {fragment_index_str} ({elapsed_str})"
-                else:
-                    percent_str = re.sub(r"\x1b\[[0-9;]*m", "", d.get("_percent_str", "")).strip()
-                    speed_str = re.sub(r"\x1b\[[0-9;]*m", "", d.get("_speed_str", "")).strip()
-                    progress_message = f"{percent_str} at {speed_str}"
+        state = self.progress_ticker.states.get(download_id)
+        if state is None:
+            return 0.0
 
-                item["progress"] = progress_message
+        throttle_seconds = 0.0
+        if d["status"] == "downloading":
+            state.update(d)
+            trace = self.tracer.get(download_id)
+            if trace:
+                trace.observe_transfer(d)
+            throttle_seconds = self.bandwidth.throttle(download_id, d.get("tmpfilename") or d.get("filename"), state.downloaded_bytes)
+            state.rate_limit = self.bandwidth.allocation_for(download_id)
+            item = state.item
+            if item["status"] != "Downloading":
+                state.finished = False
+                self._log_video_format_if_needed(item, d)
                 item["status"] = "Downloading"
-                self.socketio.emit("update_download_item", {"item": item})
+                self._save_item(item)
 
         elif d["status"] == "finished":
-            with self.lock:
-                item = self.all_items[download_id]
-                item["progress"] = "Downloaded"
-                item["status"] = "Processing"
-                logging.info(f'Download finished: {item.get("title")} - processing now')
-                self.socketio.emit("update_download_item", {"item": item})
+            state.finished = True
+            self.bandwidth.release(download_id)
+            trace = self.tracer.get(download_id)
+            if trace:
+                trace.observe_transfer(d)
+            item = state.item
+            item["progress"] = "Downloaded"
+            item["status"] = "Processing"
+            logging.info(f'Download finished: {item.get("title")} - processing now')
+            self._save_item(item)
+
+        return throttle_seconds
+
+    def _postprocessor_hook(self, d, download_id):
+        trace = self.tracer.get(download_id)
+        if trace is None:
+            return
+        postprocessor = d.get("postprocessor")
+        if d.get("status") == "started" and not trace.is_open("postprocess"):
+            trace.end("prepare")
+            trace.begin("postprocess", postprocessor=postprocessor)
+        elif d.get("status") == "finished":
+            seconds = trace.end("postprocess")
+            if seconds is not None:
+                self.postprocessor_seconds.observe(seconds, postprocessor)
 
     def _log_video_format_if_needed(self, item, d):
         if item.get("video_format_logged"):
@@ -560,7 +1413,36 @@ class DownloadManager:
         logging.info(f'Download video format: {summary} | title="{item.get("title")}"')
         item["video_format_logged"] = True
 
+    def item_trace(self, item_id):
+        item = self.all_items.get(item_id)
+        if item is None:
+            return None
+        trace = self.tracer.get(item_id)
+        if trace is None:
+            return {"id": item_id, "events": [], "summary": item.get("trace") or {}}
+        return {"id": item_id, **trace.to_dict()}
+
+    def send_download_list(self, to=None):
+        with self.lock:
+            snapshot = self.broadcaster.snapshot(self.all_items.values())
+        self.socketio.emit("update_download_list", snapshot, to=to)
+
+    def move_to_front(self, item_ids):
+        moved = self.download_queue.move_to_front(item_ids)
+        moved_items = []
+        with self.lock:
+            for item_id, priority in moved.items():
+                item = self.all_items.get(item_id)
+                if item:
+                    item["priority"] = priority
+                    moved_items.append(item)
+                    logging.info(f"Item {item_id} moved to the front of the queue.")
+        self.job_store.save_items(moved_items)
+        for item in moved_items:
+            self.broadcaster.item_updated(item)
+
     def cancel_items(self, item_ids):
+        cancelled = []
         with self.lock:
             for item_id in item_ids:
                 if item_id in self.all_items:
@@ -569,16 +1451,20 @@ class DownloadManager:
                     logging.info(f"Item {item_id} marked for cancellation.")
                     if item_id in self.stop_signals:
                         self.stop_signals[item_id].set()
-                    self.socketio.emit("update_download_item", {"item": self.all_items[item_id]})
+                    cancelled.append(self.all_items[item_id])
+        self._save_items(cancelled)
 
     def remove_items(self, item_ids):
+        removed_ids = []
         with self.lock:
             for item_id in item_ids:
                 if item_id in self.all_items:
                     logging.info(f"Removing item {item_id}")
                     if item_id in self.stop_signals:
                         self.stop_signals[item_id].set()
-                    del self.all_items[item_id]
-                    if item_id in self.stop_signals:
-                        del self.stop_signals[item_id]
-                    self.socketio.emit("remove_download_item", {"id": item_id})
+                    self._unregister_item(item_id)
+                    removed_ids.append(item_id)
+                    self.broadcaster.item_removed(item_id)
+        self.download_queue.discard(removed_ids)
+        self.tracer.discard(removed_ids)
+        self.job_store.delete_items(removed_ids)